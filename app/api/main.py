@@ -2,10 +2,89 @@
 """
 
 
-from fastapi import FastAPI
+import time
+from datetime import date
+
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.jobs.budget import check_base_currency
+from app.storage.db import get_session, init_db
+from app.storage.repository import get_job, job_stats, list_jobs
+from app.storage.sketches import ALL_SKILLS, budget_quantiles
+from app.utils.metrics import histogram, render_prometheus
 
 app = FastAPI(title="Upwork AI Job Intelligence Service")
 
+API_REQUEST_SECONDS = histogram("api_request_seconds", "API handler latency", labelnames=("method", "route", "status"))
+
+# PURPOSE: Record handler latency per route template (not raw path, to keep label cardinality bounded).
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500  # an exception escaping the handler surfaces as a 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        API_REQUEST_SECONDS.observe(
+            time.perf_counter() - start,
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=status,
+        )
+
+@app.on_event("startup")
+def create_tables():
+    check_base_currency(settings.base_currency)
+    init_db()
+
 @app.get("/health")
 def health():
     return {"status": "ok"}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+@app.get("/jobs")
+def jobs(
+    domain: str | None = None,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    include_archived: bool = False,
+    session: Session = Depends(get_session),
+):
+    return list_jobs(session, domain=domain, limit=limit, offset=offset, include_archived=include_archived)
+
+@app.get("/jobs/{job_id}")
+def job_detail(job_id: str, session: Session = Depends(get_session)):
+    job = get_job(session, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    return job
+
+@app.get("/stats")
+def stats(session: Session = Depends(get_session)):
+    return {"domains": job_stats(session), "budgets": budget_quantiles(session)}
+
+# PURPOSE: Budget percentiles from the pre-aggregated sketches (no raw-row scan).
+@app.get("/stats/budgets")
+def stats_budgets(
+    domain: str | None = None,
+    skill: str = ALL_SKILLS,
+    budget_type: str | None = Query(None, regex="^(hourly|fixed)$"),
+    since: date | None = None,
+    until: date | None = None,
+    q: list[float] = Query([0.5, 0.9]),
+    session: Session = Depends(get_session),
+):
+    if any(not 0 <= x <= 1 for x in q):
+        raise HTTPException(status_code=422, detail="quantiles must be within [0, 1]")
+    return budget_quantiles(
+        session, domain=domain, skill=skill, budget_type=budget_type, since=since, until=until, quantiles=tuple(q),
+    )
@@ -0,0 +1,102 @@
+"""PURPOSE: Token-bucket rate limiters for Upwork API calls (in-process and DB-shared across workers).
+"""
+
+
+import asyncio
+import threading
+import time
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+
+from app.storage.db import begin_write
+from app.storage.models import RateLimitBucket
+from app.utils.metrics import histogram
+
+RATE_LIMIT_WAIT_SECONDS = histogram("rate_limit_wait_seconds", "Time spent waiting for a request token")
+
+# PURPOSE: Single-process limiter; `rate` tokens/second, bursting up to `capacity`.
+class TokenBucket:
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def try_acquire(self, now: float | None = None) -> float:
+        # Take a token and return 0.0, or return the seconds to wait before retrying.
+        now = time.monotonic() if now is None else now
+        self._tokens = min(self.capacity, self._tokens + max(0.0, now - self._updated) * self.rate)
+        self._updated = max(now, self._updated)
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    async def acquire(self) -> None:
+        start = time.perf_counter()
+        async with self._lock:
+            while (wait := self.try_acquire()) > 0:
+                await asyncio.sleep(wait)
+        RATE_LIMIT_WAIT_SECONDS.observe(time.perf_counter() - start)
+
+# PURPOSE: Same algorithm, but the bucket lives in `rate_limit_buckets` so all workers (processes
+# or hosts sharing the database) spend one budget. Updates are compare-and-set on `version`,
+# which is safe on SQLite (serialized writers) and Postgres alike. Each DB round trip reserves up
+# to `batch` tokens, which this process then hands out locally without touching the database.
+class SharedTokenBucket:
+    def __init__(self, session_factory, name: str, rate: float, capacity: int, batch: int = 1):
+        self.session_factory = session_factory
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        self.batch = max(1, min(batch, capacity))
+        self._reserved = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self, now: float | None = None) -> float:
+        with self._lock:
+            if self._reserved == 0:
+                wait, self._reserved = self._reserve(time.time() if now is None else now)
+                if wait > 0:
+                    return wait
+            self._reserved -= 1
+            return 0.0
+
+    def _reserve(self, now: float) -> tuple[float, int]:
+        # Returns (seconds to wait, 0) or (0.0, tokens taken from the shared bucket).
+        with self.session_factory() as session:
+            while True:
+                begin_write(session)
+                bucket = session.get(RateLimitBucket, self.name, populate_existing=True)
+                if bucket is None:
+                    session.add(RateLimitBucket(name=self.name, tokens=self.capacity - self.batch, updated_at=now, version=0))
+                    try:
+                        session.commit()
+                        return 0.0, self.batch
+                    except IntegrityError:
+                        session.rollback()  # another worker created it first
+                        continue
+                tokens = min(self.capacity, bucket.tokens + max(0.0, now - bucket.updated_at) * self.rate)
+                if tokens < 1:
+                    session.rollback()
+                    return (1 - tokens) / self.rate, 0
+                taken = min(self.batch, int(tokens))
+                result = session.execute(
+                    update(RateLimitBucket)
+                    .where(RateLimitBucket.name == self.name, RateLimitBucket.version == bucket.version)
+                    .values(tokens=tokens - taken, updated_at=max(now, bucket.updated_at), version=bucket.version + 1)
+                    .execution_options(synchronize_session=False)
+                )
+                session.commit()
+                if result.rowcount == 1:
+                    return 0.0, taken
+                # Lost the race; re-read and try again.
+
+    async def acquire(self) -> None:
+        # The DB round trip (and any wait for the SQLite write lock) runs off the event loop.
+        start = time.perf_counter()
+        while (wait := await asyncio.to_thread(self.try_acquire)) > 0:
+            await asyncio.sleep(wait)
+        RATE_LIMIT_WAIT_SECONDS.observe(time.perf_counter() - start)
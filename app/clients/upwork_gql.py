@@ -5,11 +5,105 @@
 # PURPOSE: Wrap the Upwork GraphQL API queries and pagination.
 # Implement OAuth token usage, headers, and queries here.
 
+import asyncio
+
 import httpx
 
+from app.utils.metrics import counter, histogram
+
 API_URL = "https://api.upwork.com/graphql"
+MAX_RETRIES = 5
+
+GQL_PAGE_SECONDS = histogram("upwork_gql_page_seconds", "Latency of one Upwork GraphQL search page")
+GQL_RATE_LIMITED = counter("upwork_gql_rate_limited_total", "Upwork GraphQL responses rejected with 429")
+
+SEARCH_QUERY = """
+query searchJobs($filter: MarketplaceJobPostingsSearchFilter) {
+  marketplaceJobPostingsSearch(marketPlaceJobFilter: $filter, searchType: USER_JOBS_SEARCH) {
+    totalCount
+    edges {
+      node {
+        id
+        title
+        description
+        createdDateTime
+        totalApplicants
+        amount { rawValue currency }
+        hourlyBudgetMin { rawValue currency }
+        hourlyBudgetMax { rawValue currency }
+        client { verificationStatus location { country } }
+      }
+    }
+    pageInfo { hasNextPage endCursor }
+  }
+}
+"""
+
+def _retry_delay(resp: httpx.Response, attempt: int) -> float:
+    # Honour Retry-After when present, otherwise back off exponentially.
+    try:
+        return float(resp.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return min(0.5 * 2 ** attempt, 30.0)
+
+@GQL_PAGE_SECONDS.time()
+async def search_jobs(
+    token: str,
+    search_expression: str,
+    days_posted: int = 7,
+    first: int = 25,
+    after: str | None = None,
+    *,
+    client: httpx.AsyncClient | None = None,
+    api_url: str = API_URL,
+    tenant_id: str | None = None,
+    rate_limiter=None,
+) -> dict:
+    # Returns {"jobs": [node, ...], "total_count", "has_next_page", "end_cursor"}.
+    # Pass a shared `client` when paginating so connections are reused. `rate_limiter` (see
+    # clients/ratelimit.py) is awaited before every request, 429 retries included.
+    headers = {"Authorization": f"Bearer {token}"}
+    if tenant_id:
+        headers["X-Upwork-API-TenantId"] = tenant_id
+    pagination = {"first": first}
+    if after:
+        pagination["after"] = after
+    payload = {
+        "query": SEARCH_QUERY,
+        "variables": {
+            "filter": {
+                "searchExpression_eq": search_expression,
+                "daysPosted_eq": days_posted,
+                "pagination_eq": pagination,
+            }
+        },
+    }
+
+    owns_client = client is None
+    client = client or httpx.AsyncClient(timeout=30.0)
+    try:
+        for attempt in range(MAX_RETRIES + 1):
+            if rate_limiter is not None:
+                await rate_limiter.acquire()
+            resp = await client.post(api_url, json=payload, headers=headers)
+            if resp.status_code == 429 and attempt < MAX_RETRIES:
+                GQL_RATE_LIMITED.inc()
+                await asyncio.sleep(_retry_delay(resp, attempt))
+                continue
+            resp.raise_for_status()
+            break
+    finally:
+        if owns_client:
+            await client.aclose()
 
-async def search_jobs(token: str, search_expression: str, days_posted: int = 7, first: int = 25, after: str | None = None):
-    # TODO: Implement actual GraphQL query call and return parsed results.
-    # Suggested: use httpx.AsyncClient with Authorization: Bearer <token> + X-Upwork-API-TenantId
-    raise NotImplementedError
+    body = resp.json()
+    if body.get("errors"):
+        raise RuntimeError(f"Upwork GraphQL error: {body['errors']}")
+    search = body["data"]["marketplaceJobPostingsSearch"]
+    page_info = search.get("pageInfo") or {}
+    return {
+        "jobs": [edge["node"] for edge in search.get("edges") or []],
+        "total_count": search.get("totalCount"),
+        "has_next_page": bool(page_info.get("hasNextPage")),
+        "end_cursor": page_info.get("endCursor"),
+    }
@@ -11,8 +11,19 @@ class Settings(BaseSettings):
     upwork_redirect_uri: str | None = None
     upwork_tenant_id: str | None = None
     upwork_auth_code: str | None = None
+    upwork_access_token: str | None = None
+    upwork_api_url: str = "https://api.upwork.com/graphql"
+    upwork_requests_per_second: float = 5.0
+    upwork_request_burst: int = 10
+    upwork_token_batch: int = 5  # tokens a worker reserves per round trip to the shared bucket
+    base_currency: str = "USD"
     database_url: str = "sqlite:///./local.db"
+    archive_after_days: int = 90
+    fetch_interval_seconds: int = 900
+    lease_seconds: int = 300
     slack_webhook_url: str | None = None
+    metrics_port: int | None = None  # scheduler: serve /metrics on this port while running
+    metrics_textfile: str | None = None  # scheduler: write metrics here on exit (textfile collector)
 
     class Config:
         env_file = ".env"
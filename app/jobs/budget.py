@@ -0,0 +1,59 @@
+"""PURPOSE: Budget normalization: batch FX conversion to the base currency from a locally cached rate table.
+"""
+
+
+import csv
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+# Rates are USD value of one unit of each currency; refresh the CSV from any FX source.
+FX_RATES_PATH = Path(__file__).resolve().parents[2] / "data" / "fx_rates.csv"
+
+@lru_cache(maxsize=4)
+def load_fx_rates(path: str | None = None) -> dict[str, float]:
+    with open(path or FX_RATES_PATH, newline="", encoding="utf-8") as f:
+        return {r["currency"].upper(): float(r["usd_per_unit"]) for r in csv.DictReader(f)}
+
+# PURPOSE: Fail at startup, not on the first page, when BASE_CURRENCY has no rate in the table.
+def check_base_currency(base_currency: str, rates: dict[str, float] | None = None) -> None:
+    rates = rates or load_fx_rates()
+    if base_currency.upper() not in rates:
+        raise ValueError(f"BASE_CURRENCY {base_currency!r} has no FX rate; known: {', '.join(sorted(rates))}")
+
+# PURPOSE: Convert many amounts at once; unknown currencies (or missing amounts) become NaN.
+def convert(amounts, currencies, base_currency: str = "USD", rates: dict[str, float] | None = None) -> np.ndarray:
+    rates = rates or load_fx_rates()
+    amounts = np.asarray(amounts, dtype=float)
+    codes = np.asarray([(c or "").upper() for c in currencies])
+    if amounts.size == 0:
+        return amounts
+    base = rates.get(base_currency.upper())
+    if base is None:
+        raise ValueError(f"no FX rate for base currency {base_currency!r}")
+    # One lookup per distinct currency, then a single gather + multiply over the batch.
+    unique, inverse = np.unique(codes, return_inverse=True)
+    factors = np.array([rates.get(c, np.nan) / base for c in unique])
+    return amounts * factors[inverse]
+
+def _or_none(value: float) -> float | None:
+    return None if np.isnan(value) else round(float(value), 2)
+
+# PURPOSE: Fill budget_min_base/budget_max_base on a batch of Job rows (see fetcher.to_row).
+# Hourly rates stay per-hour and fixed prices stay totals; `budget_type` tells them apart.
+def normalize_budgets(rows: list[dict], base_currency: str = "USD", rates: dict[str, float] | None = None) -> list[dict]:
+    if not rows:
+        return rows
+    currencies = [r.get("currency") for r in rows]
+    for column in ("budget_min", "budget_max"):
+        values = [np.nan if r.get(column) is None else r[column] for r in rows]
+        for row, value in zip(rows, convert(values, currencies, base_currency, rates)):
+            row[f"{column}_base"] = _or_none(value)
+    return rows
+
+def budget_value(row: dict) -> float | None:
+    # Single representative figure for a posting: midpoint of the normalized range.
+    low, high = row.get("budget_min_base"), row.get("budget_max_base")
+    values = [v for v in (low, high) if v is not None and v > 0]
+    return sum(values) / len(values) if values else None
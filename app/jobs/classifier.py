@@ -4,15 +4,28 @@
 
 # PURPOSE: Map free-text jobs to a domain using simple keyword rules (extend with ontology IDs later).
 
+import re
+
+from app.utils.metrics import histogram
+
+CLASSIFY_SECONDS = histogram("classify_seconds", "Time to classify a single job")
+
 DOMAIN_KEYWORDS = {
     "GenAI agents": ["genai agent", "agentic ai", "autonomous agent", "langchain", "autogen", "crewai", "rag"],
     "Traditional ML": ["machine learning", "scikit-learn", "xgboost", "catboost", "time series"],
     "Computer Vision": ["computer vision", "opencv", "yolo", "detectron2", "object detection", "ocr"],
 }
 
+# Whole-word matching, same boundaries as app/jobs/skills.py: "rag" must not hit "storage".
+_DOMAIN_PATTERNS = {
+    domain: re.compile(r"(?<![\w-])(?:" + "|".join(re.escape(w) for w in words) + r")(?![\w-])", re.IGNORECASE)
+    for domain, words in DOMAIN_KEYWORDS.items()
+}
+
+@CLASSIFY_SECONDS.time()
 def classify(text: str) -> str | None:
-    t = (text or "").lower()
-    for domain, words in DOMAIN_KEYWORDS.items():
-        if any(w in t for w in words):
+    t = text or ""
+    for domain, pattern in _DOMAIN_PATTERNS.items():
+        if pattern.search(t):
             return domain
     return None
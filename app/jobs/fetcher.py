@@ -4,13 +4,148 @@
 
 # PURPOSE: High-level orchestration to fetch jobs per domain and persist them.
 
-from app.jobs.classifier import classify
-# from app.clients.upwork_gql import search_jobs  # implement later
-# from app.storage.db import SessionLocal
-# from app.storage.models import Job
+import asyncio
+from datetime import datetime
 
-def fetch_and_store():
-    # 1) Call Upwork GraphQL client per domain (implement in clients/upwork_gql.py)
+import httpx
+
+from app.clients.upwork_gql import search_jobs
+from app.config import settings
+from app.jobs.budget import normalize_budgets
+from app.jobs.classifier import DOMAIN_KEYWORDS, classify
+from app.storage.db import SessionLocal
+from app.storage.repository import upsert_new_jobs
+from app.storage.sketches import record_budgets
+from app.utils.logging import get_logger
+from app.utils.metrics import gauge
+
+FETCH_QUEUE_DEPTH = gauge("fetch_queue_depth", "Search expressions waiting to be fetched")
+
+# One OR-expression per domain, built from the classifier keywords.
+DOMAIN_SEARCH_EXPRESSIONS = {
+    domain: " OR ".join(f'"{w}"' for w in words) for domain, words in DOMAIN_KEYWORDS.items()
+}
+
+logger = get_logger(__name__)
+
+def _money(value: dict | None) -> tuple[float | None, str | None]:
+    if not value or value.get("rawValue") in (None, ""):
+        return None, None
+    return float(value["rawValue"]), value.get("currency")  # keep cents: "12.50" -> 12.5
+
+def _parse_datetime(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    # Stored naive in UTC, matching Job.created_at.
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).replace(tzinfo=None)
+
+# PURPOSE: Map one GraphQL job node to Job column values. The classifier decides the domain so
+# a posting matched by several searches gets the same one whichever search runs first; the
+# search's domain only fills in when no keyword matches (saved searches).
+def to_row(node: dict, search_domain: str | None = None) -> dict:
+    fixed, currency = _money(node.get("amount"))
+    hourly_min, min_currency = _money(node.get("hourlyBudgetMin"))
+    hourly_max, max_currency = _money(node.get("hourlyBudgetMax"))
+    if hourly_min is not None or hourly_max is not None:
+        budget_type = "hourly"
+    else:
+        budget_type = "fixed" if fixed is not None else None
+    client = node.get("client") or {}
+    title = node.get("title")
+    description = node.get("description")
+    return {
+        "id": str(node["id"]),
+        "title": title,
+        "description": description,
+        "domain": classify(f"{title or ''}\n{description or ''}") or search_domain,
+        "budget_min": hourly_min if hourly_min is not None else fixed,
+        "budget_max": hourly_max if hourly_max is not None else fixed,
+        "currency": currency or min_currency or max_currency,
+        "budget_type": budget_type,
+        "verified_client": client.get("verificationStatus") == "VERIFIED",
+        "location": (client.get("location") or {}).get("country"),
+        "posted_date": _parse_datetime(node.get("createdDateTime")),
+        "proposals": node.get("totalApplicants"),
+        "json_raw": node,
+    }
+
+# PURPOSE: Normalize one page and store it with its sketch update (blocking; see fetch_expression).
+def _store_page(session_factory, nodes: list[dict], domain: str | None) -> int:
+    rows = normalize_budgets([to_row(node, domain) for node in nodes], settings.base_currency)
+    with session_factory() as session:
+        # Only first sightings feed the budget sketches; re-fetched postings would double count.
+        # One transaction, so a job is never stored without its sketch update or vice versa.
+        fresh = upsert_new_jobs(session, rows)
+        record_budgets(session, [r for r in rows if r["id"] in fresh], settings.base_currency, commit=False)
+        session.commit()
+    return len({r["id"] for r in rows})
+
+async def fetch_expression(
+    http: httpx.AsyncClient,
+    session_factory,
+    token: str,
+    search_expression: str,
+    domain: str | None = None,
+    *,
+    api_url: str,
+    tenant_id: str | None = None,
+    days_posted: int = 7,
+    page_size: int = 50,
+    max_pages: int | None = None,
+    rate_limiter=None,
+) -> int:
+    # Walk every page of one search expression, upserting each page as a batch.
+    # `rate_limiter` is handed to search_jobs, which spends a token on every request it sends.
+    stored, after, pages = 0, None, 0
+    while True:
+        page = await search_jobs(
+            token, search_expression, days_posted=days_posted, first=page_size, after=after,
+            client=http, api_url=api_url, tenant_id=tenant_id, rate_limiter=rate_limiter,
+        )
+        # Off the event loop: a write waiting on the database must not stall heartbeats or pacing.
+        stored += await asyncio.to_thread(_store_page, session_factory, page["jobs"], domain)
+        pages += 1
+        if not page["has_next_page"] or (max_pages is not None and pages >= max_pages):
+            return stored
+        after = page["end_cursor"]
+
+async def fetch_and_store_async(
+    session_factory=None,
+    token: str | None = None,
+    search_expressions: dict[str, str] | None = None,
+    *,
+    api_url: str | None = None,
+    tenant_id: str | None = None,
+    days_posted: int = 7,
+    page_size: int = 50,
+    max_pages: int | None = None,
+    rate_limiter=None,
+) -> int:
+    session_factory = session_factory or SessionLocal
+    token = token or settings.upwork_access_token
+    api_url = api_url or settings.upwork_api_url
+    tenant_id = tenant_id or settings.upwork_tenant_id
+    if not token:
+        raise RuntimeError("UPWORK_ACCESS_TOKEN is not set")
+    pending = list((search_expressions or DOMAIN_SEARCH_EXPRESSIONS).items())
+
+    total = 0
+    async with httpx.AsyncClient(timeout=30.0) as http:
+        while pending:
+            FETCH_QUEUE_DEPTH.set(len(pending))
+            domain, expression = pending.pop(0)
+            stored = await fetch_expression(
+                http, session_factory, token, expression, domain,
+                api_url=api_url, tenant_id=tenant_id, days_posted=days_posted,
+                page_size=page_size, max_pages=max_pages, rate_limiter=rate_limiter,
+            )
+            logger.info("fetched %s jobs for %s", stored, domain, extra={"domain": domain, "stored": stored})
+            total += stored
+    FETCH_QUEUE_DEPTH.set(0)
+    return total
+
+def fetch_and_store(**kwargs) -> int:
+    # 1) Call Upwork GraphQL client per domain (clients/upwork_gql.py)
     # 2) Classify using classifier.classify()
-    # 3) Upsert into DB
-    pass
+    # 3) Upsert into DB, one batch per page
+    return asyncio.run(fetch_and_store_async(**kwargs))
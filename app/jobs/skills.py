@@ -0,0 +1,54 @@
+"""PURPOSE: Extract canonical taxonomy skills from job text (names + aliases from taxonomy/*.yaml).
+"""
+
+
+import re
+from functools import lru_cache
+from pathlib import Path
+
+import yaml
+
+TAXONOMY_DIR = Path(__file__).resolve().parents[2] / "taxonomy"
+
+# PURPOSE: The one reader of taxonomy/*.yaml: canonical skill name -> {"aliases", "keywords"}, in file
+# order, with aliases.yaml folded into "aliases". Extraction and the synthetic data generator share it.
+@lru_cache(maxsize=4)
+def load_taxonomy(taxonomy_dir: str | Path | None = None) -> dict[str, dict[str, list[str]]]:
+    root = Path(taxonomy_dir) if taxonomy_dir else TAXONOMY_DIR
+    skills: dict[str, dict[str, list[str]]] = {}
+    for path in sorted(root.glob("skills.*.yaml")):
+        doc = yaml.safe_load(path.read_text(encoding="utf-8"))
+        for category in doc.get("categories") or []:
+            for skill in category.get("skills") or []:
+                entry = skills.setdefault(skill["name"], {"aliases": [], "keywords": []})
+                entry["aliases"].extend(skill.get("aliases") or [])
+                entry["keywords"].extend(skill.get("keywords") or [])
+    aliases_path = root / "aliases.yaml"
+    if aliases_path.exists():
+        doc = yaml.safe_load(aliases_path.read_text(encoding="utf-8"))
+        for alias, canonical in (doc.get("aliases") or {}).items():
+            skills.setdefault(canonical, {"aliases": [], "keywords": []})["aliases"].append(str(alias))
+    return skills
+
+# PURPOSE: surface form (lowercased) -> canonical skill name. Keywords are topic hints, not names of
+# the skill, so they are not extracted.
+@lru_cache(maxsize=4)
+def load_surface_forms(taxonomy_dir: str | Path | None = None) -> dict[str, str]:
+    forms: dict[str, str] = {}
+    for name, entry in load_taxonomy(taxonomy_dir).items():
+        for form in [name, *entry["aliases"]]:
+            forms.setdefault(form.lower(), name)
+    return forms
+
+@lru_cache(maxsize=4)
+def _pattern(taxonomy_dir: str | Path | None = None) -> re.Pattern:
+    # One alternation, longest forms first so "vector db" wins over shorter overlaps.
+    forms = sorted(load_surface_forms(taxonomy_dir), key=len, reverse=True)
+    return re.compile(r"(?<![\w-])(" + "|".join(re.escape(f) for f in forms) + r")(?![\w-])", re.IGNORECASE)
+
+def extract_skills(text: str | None, taxonomy_dir: str | Path | None = None) -> list[str]:
+    if not text:
+        return []
+    forms = load_surface_forms(taxonomy_dir)
+    found = {forms[m.group(1).lower()] for m in _pattern(taxonomy_dir).finditer(text)}
+    return sorted(found)
@@ -3,11 +3,174 @@
 
 
 # PURPOSE: Entrypoint for scheduled fetches (e.g., every 15 minutes).
-# Wire up a real scheduler or call from external CRON/Cloud Scheduler.
+# Two modes:
+#   python -m app.scheduler.cron            one sweep over every domain (call from CRON/Cloud Scheduler)
+#   python -m app.scheduler.cron --worker   lease searches from `search_leases`; run N of these on
+#                                           any number of hosts sharing DATABASE_URL to scale out
+# Both modes also move jobs older than ARCHIVE_AFTER_DAYS into the archive tier: after each sweep,
+# or as the leased ARCHIVE_TASK so exactly one worker runs it per interval.
+# Ingestion metrics live in this process, not the API's: --metrics-port serves them while it runs
+# (workers), --metrics-textfile writes them on exit (sweeps, via node_exporter's textfile collector).
+
+import argparse
+import asyncio
+import os
+import socket
+import threading
+
+import httpx
+
+from app.clients.ratelimit import SharedTokenBucket
+from app.config import settings
+from app.jobs.budget import check_base_currency
+from app.jobs.fetcher import DOMAIN_SEARCH_EXPRESSIONS, FETCH_QUEUE_DEPTH, fetch_and_store, fetch_expression
+from app.scheduler.leases import claim, due_count, heartbeat, register_searches, release
+from app.storage.archive import archive_jobs
+from app.storage.db import SessionLocal, init_db
+from app.utils.logging import get_logger
+from app.utils.metrics import start_http_server, write_textfile
+
+logger = get_logger(__name__)
+
+# Lease key of the archive maintenance task; queued next to the searches, never sent to the API.
+ARCHIVE_TASK = "maintenance:archive"
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def archive(session_factory=None, stop: threading.Event | None = None) -> int:
+    with (session_factory or SessionLocal)() as session:
+        moved = archive_jobs(session, settings.archive_after_days, stop=stop)
+    logger.info("archived %s jobs older than %s days", moved, settings.archive_after_days)
+    return moved
 
 def run():
-    # TODO: import and call fetch_and_store()
-    print("Scheduler placeholder")
+    check_base_currency(settings.base_currency)
+    init_db()
+    stored = fetch_and_store()
+    logger.info("sweep stored %s jobs", stored)
+    archive()
+
+# Lease bookkeeping is blocking DB work; the worker runs it through asyncio.to_thread so a wait on
+# the database never stalls heartbeats or the fetch in flight.
+def _with_session(session_factory, fn, *args, **kwargs):
+    with session_factory() as session:
+        return fn(session, *args, **kwargs)
+
+def _claim_next(session, worker_id: str, lease_seconds: int) -> list[dict]:
+    FETCH_QUEUE_DEPTH.set(due_count(session))
+    return claim(session, worker_id, lease_seconds=lease_seconds)
+
+async def _keep_alive(session_factory, worker_id: str, key: str, lease_seconds: int, work: asyncio.Task, lost: asyncio.Event) -> None:
+    # Renew well before expiry; a worker that stops heartbeating (crash, hang) loses the lease.
+    # Once another worker holds the lease, stop working on it: the new holder redoes the search.
+    while True:
+        await asyncio.sleep(lease_seconds / 3)
+        if not await asyncio.to_thread(_with_session, session_factory, heartbeat, worker_id, [key], lease_seconds):
+            logger.warning("lost lease on %s, cancelling", key, extra={"search": key, "worker": worker_id})
+            lost.set()
+            work.cancel()
+            return
+
+# PURPOSE: Claim -> fetch -> release loop. With `drain=True`, exit once nothing is due.
+async def run_worker_async(
+    worker_id: str | None = None,
+    session_factory=None,
+    token: str | None = None,
+    *,
+    api_url: str | None = None,
+    tenant_id: str | None = None,
+    rate_limiter=None,
+    lease_seconds: int | None = None,
+    interval_seconds: int | None = None,
+    poll_seconds: float = 5.0,
+    page_size: int = 50,
+    drain: bool = False,
+) -> int:
+    worker_id = worker_id or default_worker_id()
+    session_factory = session_factory or SessionLocal
+    token = token or settings.upwork_access_token
+    api_url = api_url or settings.upwork_api_url
+    tenant_id = tenant_id or settings.upwork_tenant_id
+    lease_seconds = lease_seconds or settings.lease_seconds
+    interval_seconds = interval_seconds or settings.fetch_interval_seconds
+    if rate_limiter is None:
+        rate_limiter = SharedTokenBucket(
+            session_factory, "upwork", settings.upwork_requests_per_second, settings.upwork_request_burst,
+            batch=settings.upwork_token_batch,
+        )
+    if not token:
+        raise RuntimeError("UPWORK_ACCESS_TOKEN is not set")
+
+    total = 0
+    async with httpx.AsyncClient(timeout=30.0) as http:
+        while True:
+            leases = await asyncio.to_thread(_with_session, session_factory, _claim_next, worker_id, lease_seconds)
+            if not leases:
+                if drain:
+                    return total
+                await asyncio.sleep(poll_seconds)
+                continue
+
+            lease = leases[0]
+            archiving, stop = None, threading.Event()
+            if lease["key"] == ARCHIVE_TASK:
+                # Cancelling can't stop a thread: `stop` ends archive_jobs between batches instead,
+                # and the lease is released only after the thread has returned.
+                archiving = asyncio.ensure_future(asyncio.to_thread(archive, session_factory, stop))
+                work = asyncio.shield(archiving)
+            else:
+                work = asyncio.create_task(fetch_expression(
+                    http, session_factory, token, lease["expression"], lease["domain"],
+                    api_url=api_url, tenant_id=tenant_id, page_size=page_size, rate_limiter=rate_limiter,
+                ))
+            lost = asyncio.Event()
+            keep_alive = asyncio.create_task(_keep_alive(session_factory, worker_id, lease["key"], lease_seconds, work, lost))
+            success = False
+            try:
+                done = await work
+                success = True
+                if lease["key"] != ARCHIVE_TASK:
+                    total += done
+                    logger.info("fetched %s jobs for %s", done, lease["key"], extra={"search": lease["key"], "worker": worker_id})
+            except asyncio.CancelledError:
+                if not lost.is_set():
+                    raise  # the worker itself is shutting down
+            except Exception:
+                logger.exception("task failed for %s", lease["key"], extra={"search": lease["key"], "worker": worker_id})
+            finally:
+                keep_alive.cancel()
+                work.cancel()
+                if archiving is not None:
+                    stop.set()
+                    await asyncio.wait([archiving])
+                await asyncio.to_thread(
+                    _with_session, session_factory, release, worker_id, lease["key"], interval_seconds, success=success,
+                )
+
+def run_worker(worker_id: str | None = None, drain: bool = False) -> int:
+    check_base_currency(settings.base_currency)
+    init_db()
+    with SessionLocal() as session:
+        register_searches(session, DOMAIN_SEARCH_EXPRESSIONS, domains={d: d for d in DOMAIN_SEARCH_EXPRESSIONS})
+        register_searches(session, {ARCHIVE_TASK: "archive_jobs"})
+    return asyncio.run(run_worker_async(worker_id, drain=drain))
 
 if __name__ == "__main__":
-    run()
+    parser = argparse.ArgumentParser(description="Scheduled Upwork job ingestion")
+    parser.add_argument("--worker", action="store_true", help="Lease searches from the shared queue")
+    parser.add_argument("--worker-id", default=None, help="Defaults to <hostname>:<pid>")
+    parser.add_argument("--drain", action="store_true", help="Worker exits once no search is due")
+    parser.add_argument("--metrics-port", type=int, default=settings.metrics_port, help="Serve GET /metrics on this port")
+    parser.add_argument("--metrics-textfile", default=settings.metrics_textfile, help="Write metrics to this file on exit")
+    args = parser.parse_args()
+    if args.metrics_port:
+        start_http_server(args.metrics_port)
+    try:
+        if args.worker:
+            run_worker(args.worker_id, drain=args.drain)
+        else:
+            run()
+    finally:
+        if args.metrics_textfile:
+            write_textfile(args.metrics_textfile)
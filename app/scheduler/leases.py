@@ -0,0 +1,121 @@
+"""PURPOSE: DB-backed lease queue distributing saved search expressions across ingestion workers.
+"""
+
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.storage.db import begin_write
+from app.storage.models import SearchLease
+
+# Failed searches back off exponentially from this delay, capped at the normal interval.
+RETRY_BASE_SECONDS = 30
+
+def _claimable(now: datetime):
+    return and_(
+        SearchLease.next_run_at <= now,
+        or_(SearchLease.leased_by.is_(None), SearchLease.lease_expires_at < now),
+    )
+
+def _as_dict(lease: SearchLease) -> dict:
+    return {"key": lease.key, "domain": lease.domain, "expression": lease.expression}
+
+# PURPOSE: Add saved searches (key -> expression) that are not queued yet; existing rows and their
+# schedule are kept. `domains` optionally maps a key to the domain assigned to its results.
+def register_searches(session: Session, expressions: dict[str, str], domains: dict[str, str] | None = None) -> int:
+    begin_write(session)
+    existing = set(session.scalars(select(SearchLease.key).where(SearchLease.key.in_(list(expressions)))))
+    added = 0
+    for key, expression in expressions.items():
+        if key in existing:
+            continue
+        session.add(SearchLease(key=key, domain=(domains or {}).get(key), expression=expression))
+        try:
+            session.commit()
+            added += 1
+        except IntegrityError:
+            session.rollback()  # registered concurrently by another worker
+    return added
+
+# PURPOSE: Lease up to `limit` due searches to `worker_id` for `lease_seconds`.
+# Postgres: SELECT ... FOR UPDATE SKIP LOCKED, so concurrent workers never block on each other.
+# Other dialects (SQLite): per-row compare-and-set UPDATE; SQLite serializes writers, so a row
+# is won by exactly one worker and losers move on to the next candidate.
+def claim(session: Session, worker_id: str, limit: int = 1, lease_seconds: int = 300, now: datetime | None = None) -> list[dict]:
+    now = now or datetime.utcnow()
+    lease = {"leased_by": worker_id, "lease_expires_at": now + timedelta(seconds=lease_seconds), "heartbeat_at": now}
+    stmt = select(SearchLease).where(_claimable(now)).order_by(SearchLease.next_run_at, SearchLease.key)
+
+    if session.get_bind().dialect.name == "postgresql":
+        rows = session.scalars(stmt.limit(limit).with_for_update(skip_locked=True)).all()
+        for row in rows:
+            for attr, value in lease.items():
+                setattr(row, attr, value)
+        claimed = [_as_dict(r) for r in rows]
+        session.commit()
+        return claimed
+
+    claimed = []
+    # Over-fetch candidates so a few lost races still fill the batch.
+    candidates = [_as_dict(r) for r in session.scalars(stmt.limit(limit * 4))]
+    session.commit()  # don't sit on the SQLite write lock (see db.make_engine) between the CAS updates
+    for candidate in candidates:
+        result = session.execute(
+            update(SearchLease)
+            .where(SearchLease.key == candidate["key"], _claimable(now))
+            .values(**lease)
+            .execution_options(synchronize_session=False)
+        )
+        session.commit()
+        if result.rowcount == 1:
+            claimed.append(candidate)
+            if len(claimed) >= limit:
+                break
+    return claimed
+
+# PURPOSE: Extend leases still held by `worker_id`; returns the keys it still owns.
+def heartbeat(session: Session, worker_id: str, keys: list[str], lease_seconds: int = 300, now: datetime | None = None) -> list[str]:
+    now = now or datetime.utcnow()
+    session.execute(
+        update(SearchLease)
+        .where(SearchLease.key.in_(keys), SearchLease.leased_by == worker_id)
+        .values(lease_expires_at=now + timedelta(seconds=lease_seconds), heartbeat_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    held = list(session.scalars(select(SearchLease.key).where(SearchLease.key.in_(keys), SearchLease.leased_by == worker_id)))
+    session.commit()
+    return held
+
+# PURPOSE: Hand a search back; schedule the next run (or a backoff retry on failure).
+def release(
+    session: Session,
+    worker_id: str,
+    key: str,
+    interval_seconds: int,
+    success: bool = True,
+    now: datetime | None = None,
+) -> bool:
+    now = now or datetime.utcnow()
+    begin_write(session)
+    values = {"leased_by": None, "lease_expires_at": None}
+    if success:
+        values.update(next_run_at=now + timedelta(seconds=interval_seconds), last_completed_at=now, failures=0)
+    else:
+        failures = session.scalar(select(SearchLease.failures).where(SearchLease.key == key)) or 0
+        delay = min(interval_seconds, RETRY_BASE_SECONDS * 2 ** failures)
+        values.update(next_run_at=now + timedelta(seconds=delay), failures=failures + 1)
+    result = session.execute(
+        update(SearchLease)
+        .where(SearchLease.key == key, SearchLease.leased_by == worker_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    session.commit()
+    # False when the lease expired and was taken over; the new holder will reschedule it.
+    return result.rowcount == 1
+
+def due_count(session: Session, now: datetime | None = None) -> int:
+    return session.scalar(select(func.count()).select_from(SearchLease).where(_claimable(now or datetime.utcnow())))
@@ -0,0 +1,126 @@
+"""PURPOSE: Hot/cold tiering: move aged jobs into the compressed archive table (month-partitioned on Postgres).
+"""
+
+
+import argparse
+import json
+import threading
+from datetime import date, datetime, timedelta
+
+import zstandard
+from sqlalchemy import and_, delete, insert, select, text
+from sqlalchemy.orm import Session
+
+from app.storage.db import begin_write
+from app.storage.models import Job, JobArchive
+from app.utils.logging import get_logger
+from app.utils.metrics import counter, histogram
+
+ARCHIVE_BATCH_SIZE = 1000
+ZSTD_LEVEL = 10
+
+ARCHIVED_JOBS = counter("jobs_archived_total", "Jobs moved from the hot table to the archive")
+ARCHIVE_BATCH_SECONDS = histogram("archive_batch_seconds", "Time to archive one batch of jobs")
+
+logger = get_logger(__name__)
+
+# PURPOSE: Compress the bulky, rarely-read fields of a job (description + json_raw).
+def compress_payload(data: dict, compressor: zstandard.ZstdCompressor | None = None) -> bytes:
+    compressor = compressor or zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+    return compressor.compress(json.dumps(data, separators=(",", ":"), default=str).encode())
+
+def decompress_payload(blob: bytes | None) -> dict:
+    if not blob:
+        return {}
+    return json.loads(zstandard.ZstdDecompressor().decompress(blob))
+
+def month_start(value: datetime | date) -> date:
+    return date(value.year, value.month, 1)
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+# PURPOSE: Create the monthly range partition on Postgres; a no-op elsewhere (SQLite keeps
+# one table and relies on the (domain, archive_month) and posted_date indexes).
+def ensure_partition(session: Session, month: date) -> None:
+    if session.get_bind().dialect.name != "postgresql":
+        return
+    session.execute(text(
+        f"CREATE TABLE IF NOT EXISTS jobs_archive_{month:%Y_%m} PARTITION OF jobs_archive "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_next_month(month).isoformat()}')"
+    ))
+
+def _to_archive_row(job: Job, compressor: zstandard.ZstdCompressor) -> dict:
+    posted = job.posted_date or job.created_at
+    return {
+        "id": job.id,
+        "archive_month": month_start(posted),
+        "title": job.title,
+        "domain": job.domain,
+        "budget_min": job.budget_min,
+        "budget_max": job.budget_max,
+        "currency": job.currency,
+        "budget_type": job.budget_type,
+        "budget_min_base": job.budget_min_base,
+        "budget_max_base": job.budget_max_base,
+        "verified_client": job.verified_client,
+        "location": job.location,
+        "posted_date": job.posted_date,
+        "proposals": job.proposals,
+        "payload": compress_payload({"description": job.description, "json_raw": job.json_raw}, compressor),
+        "created_at": job.created_at,
+        "archived_at": datetime.utcnow(),
+    }
+
+# PURPOSE: Move jobs posted more than `older_than_days` ago out of the hot table, in batches.
+# Setting `stop` ends the run between batches; every committed batch stays archived.
+def archive_jobs(
+    session: Session,
+    older_than_days: int,
+    now: datetime | None = None,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    stop: threading.Event | None = None,
+) -> int:
+    cutoff = (now or datetime.utcnow()) - timedelta(days=older_than_days)
+    # Two index scans rather than coalesce(posted_date, created_at) < cutoff, which no index serves:
+    # dated jobs by posted_date range, then the few undated ones (posted_date IS NULL).
+    scans = [
+        select(Job).where(Job.posted_date < cutoff).order_by(Job.posted_date),
+        select(Job).where(and_(Job.posted_date.is_(None), Job.created_at < cutoff)).order_by(Job.created_at),
+    ]
+    compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+    partitions: set[date] = set()
+    moved = 0
+    while scans and (stop is None or not stop.is_set()):
+        begin_write(session)
+        jobs = session.scalars(scans[0].limit(batch_size)).all()
+        if not jobs:
+            session.rollback()
+            scans.pop(0)
+            continue
+        with ARCHIVE_BATCH_SECONDS.time():
+            rows = [_to_archive_row(j, compressor) for j in jobs]
+            for month in {r["archive_month"] for r in rows} - partitions:
+                ensure_partition(session, month)
+                partitions.add(month)
+            ids = [r["id"] for r in rows]
+            # Replace any earlier archived copy (a job can be re-fetched after archiving).
+            session.execute(delete(JobArchive).where(JobArchive.id.in_(ids)))
+            session.execute(insert(JobArchive), rows)
+            session.execute(delete(Job).where(Job.id.in_(ids)))
+            session.commit()
+        session.expunge_all()
+        moved += len(rows)
+        ARCHIVED_JOBS.inc(len(rows))
+    return moved
+
+if __name__ == "__main__":
+    from app.config import settings
+    from app.storage.db import SessionLocal, init_db
+
+    parser = argparse.ArgumentParser(description="Move aged jobs into the archive tier")
+    parser.add_argument("--days", type=int, default=settings.archive_after_days, help="Archive jobs older than this")
+    args = parser.parse_args()
+    init_db()
+    with SessionLocal() as session:
+        logger.info("archived %s jobs older than %s days", archive_jobs(session, args.days), args.days)
@@ -2,10 +2,59 @@
 """
 
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
 from app.config import settings
+from app.storage.models import Base
+
+# PURPOSE: Engine for `url`. A SQLite file may be shared by the API and several worker processes,
+# so it runs in WAL mode (readers never block) with a busy timeout for writers. Transactions start
+# with a plain deferred BEGIN; write paths call begin_write() first.
+def make_engine(url: str):
+    engine = create_engine(url, future=True)
+    if engine.dialect.name != "sqlite":
+        return engine
+
+    @event.listens_for(engine, "connect")
+    def _configure(dbapi_connection, _record):
+        dbapi_connection.isolation_level = None  # pysqlite: let the "begin" hook issue BEGIN
+        dbapi_connection.execute("PRAGMA journal_mode=WAL")
+        dbapi_connection.execute("PRAGMA busy_timeout=30000")
+
+    @event.listens_for(engine, "begin")
+    def _begin(connection):
+        mode = connection.get_execution_options().get("sqlite_begin")
+        connection.exec_driver_sql(f"BEGIN {mode}" if mode else "BEGIN")
+
+    return engine
+
+# PURPOSE: Open the session's next transaction as a writer. On SQLite that is BEGIN IMMEDIATE: the
+# write lock is awaited up front (busy_timeout), where a deferred transaction that reads and then
+# writes fails with "database is locked" once another process has written in between. A no-op on
+# other dialects, or when the session already has a transaction open.
+def begin_write(session: Session) -> None:
+    if session.in_transaction() or session.get_bind().dialect.name != "sqlite":
+        return
+    session.connection(execution_options={"sqlite_begin": "IMMEDIATE"})
 
 # PURPOSE: Initialize database engine and session factory.
-engine = create_engine(settings.database_url, future=True)
+engine = make_engine(settings.database_url)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+
+# PURPOSE: Create missing tables (stand-in until Alembic migrations exist).
+def init_db(bind=None) -> None:
+    Base.metadata.create_all(bind or engine)
+
+# PURPOSE: Engine + session factory on a fresh SQLite file with every table created (tests, benchmarks).
+def sqlite_session_factory(path):
+    engine = make_engine(f"sqlite:///{path}")
+    init_db(engine)
+    return engine, sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+
+# PURPOSE: FastAPI dependency yielding a request-scoped session.
+def get_session():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
@@ -3,8 +3,8 @@
 
 
 from sqlalchemy.orm import declarative_base, Mapped, mapped_column
-from sqlalchemy import String, Integer, DateTime, JSON, Boolean
-from datetime import datetime
+from sqlalchemy import String, Integer, Float, DateTime, Date, JSON, Boolean, LargeBinary, Index
+from datetime import date, datetime
 
 # PURPOSE: Define core ORM models for job data.
 Base = declarative_base()
@@ -13,14 +13,84 @@ class Job(Base):
     __tablename__ = "jobs"
     id: Mapped[str] = mapped_column(String, primary_key=True)  # Upwork job ID
     title: Mapped[str | None] = mapped_column(String, nullable=True)
-    domain: Mapped[str | None] = mapped_column(String, nullable=True)
+    domain: Mapped[str | None] = mapped_column(String, nullable=True, index=True)
     description: Mapped[str | None] = mapped_column(String, nullable=True)
-    budget_min: Mapped[int | None] = mapped_column(Integer, nullable=True)
-    budget_max: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    budget_min: Mapped[float | None] = mapped_column(Float, nullable=True)  # in `currency`
+    budget_max: Mapped[float | None] = mapped_column(Float, nullable=True)
     currency: Mapped[str | None] = mapped_column(String, nullable=True)
+    budget_type: Mapped[str | None] = mapped_column(String, nullable=True)  # "hourly" | "fixed"
+    budget_min_base: Mapped[float | None] = mapped_column(Float, nullable=True)  # in settings.base_currency
+    budget_max_base: Mapped[float | None] = mapped_column(Float, nullable=True)
     verified_client: Mapped[bool] = mapped_column(Boolean, default=False)
     location: Mapped[str | None] = mapped_column(String, nullable=True)
-    posted_date: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    posted_date: Mapped[datetime | None] = mapped_column(DateTime, nullable=True, index=True)
     proposals: Mapped[int | None] = mapped_column(Integer, nullable=True)
     json_raw: Mapped[dict | None] = mapped_column(JSON, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+# PURPOSE: Cold tier for jobs older than the archive cutoff (see app/storage/archive.py).
+# Only the queryable columns stay plain; description + json_raw live zstd-compressed in `payload`.
+# On Postgres the table is range-partitioned by month; partitions are created on demand.
+class JobArchive(Base):
+    __tablename__ = "jobs_archive"
+    __table_args__ = (
+        Index("ix_jobs_archive_domain_month", "domain", "archive_month"),
+        {"postgresql_partition_by": "RANGE (archive_month)"},
+    )
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    # Partition key: first day of the posting month. Part of the PK because Postgres requires it.
+    archive_month: Mapped[date] = mapped_column(Date, primary_key=True)
+    title: Mapped[str | None] = mapped_column(String, nullable=True)
+    domain: Mapped[str | None] = mapped_column(String, nullable=True)
+    budget_min: Mapped[float | None] = mapped_column(Float, nullable=True)  # in `currency`
+    budget_max: Mapped[float | None] = mapped_column(Float, nullable=True)
+    currency: Mapped[str | None] = mapped_column(String, nullable=True)
+    budget_type: Mapped[str | None] = mapped_column(String, nullable=True)  # "hourly" | "fixed"
+    budget_min_base: Mapped[float | None] = mapped_column(Float, nullable=True)  # in settings.base_currency
+    budget_max_base: Mapped[float | None] = mapped_column(Float, nullable=True)
+    verified_client: Mapped[bool] = mapped_column(Boolean, default=False)
+    location: Mapped[str | None] = mapped_column(String, nullable=True)
+    posted_date: Mapped[datetime | None] = mapped_column(DateTime, nullable=True, index=True)
+    proposals: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    payload: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    archived_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+# PURPOSE: Work queue of saved search expressions leased to ingestion workers (app/scheduler/leases.py).
+# A row is claimable when it is due and either unleased or its lease has expired (crashed worker).
+class SearchLease(Base):
+    __tablename__ = "search_leases"
+    __table_args__ = (Index("ix_search_leases_due", "next_run_at", "lease_expires_at"),)
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    domain: Mapped[str | None] = mapped_column(String, nullable=True)
+    expression: Mapped[str] = mapped_column(String)
+    next_run_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    leased_by: Mapped[str | None] = mapped_column(String, nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_completed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    failures: Mapped[int] = mapped_column(Integer, default=0)
+
+# PURPOSE: Shared token bucket state so every worker draws from one API request budget.
+class RateLimitBucket(Base):
+    __tablename__ = "rate_limit_buckets"
+    name: Mapped[str] = mapped_column(String, primary_key=True)
+    tokens: Mapped[float] = mapped_column(Float)
+    updated_at: Mapped[float] = mapped_column(Float)  # epoch seconds
+    version: Mapped[int] = mapped_column(Integer, default=0)
+
+# PURPOSE: Budget quantile sketch per domain x skill x month x budget type x currency (app/storage/sketches.py).
+# skill "*" aggregates every posting in the domain. Sketches merge exactly, so any range of
+# months or set of skills is answered by merging rows instead of sorting raw jobs. The currency
+# is part of the key: sketches kept under an earlier BASE_CURRENCY never merge with current ones.
+class BudgetSketch(Base):
+    __tablename__ = "budget_sketches"
+    domain: Mapped[str] = mapped_column(String, primary_key=True)
+    skill: Mapped[str] = mapped_column(String, primary_key=True)
+    month: Mapped[date] = mapped_column(Date, primary_key=True)
+    budget_type: Mapped[str] = mapped_column(String, primary_key=True)
+    currency: Mapped[str] = mapped_column(String, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, default=0)
+    sketch: Mapped[dict] = mapped_column(JSON)
+    version: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
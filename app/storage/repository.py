@@ -0,0 +1,139 @@
+"""PURPOSE: Persistence helpers: bulk upsert and read queries for jobs.
+"""
+
+
+from sqlalchemy import func, select, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.storage.archive import decompress_payload
+from app.storage.db import begin_write
+from app.storage.models import Job, JobArchive
+from app.utils.metrics import histogram
+
+UPSERT_BATCH_SECONDS = histogram("upsert_batch_seconds", "Time to upsert one batch of jobs")
+
+_INSERTS = {"sqlite": sqlite_insert, "postgresql": pg_insert}
+
+# Columns an update of an already stored job leaves alone.
+_KEPT_ON_UPDATE = ("id", "created_at", "domain")
+
+def _dedupe(rows: list[dict]) -> list[dict]:
+    # Last occurrence wins; Postgres rejects duplicate keys within one ON CONFLICT statement.
+    # Sorted by id so concurrent writers lock rows in the same order.
+    return sorted({r["id"]: r for r in rows}.values(), key=lambda r: r["id"])
+
+# PURPOSE: Insert-or-update jobs by Upwork ID without committing; returns the IDs stored for the
+# first time (in neither tier). The INSERT ... ON CONFLICT DO NOTHING RETURNING itself decides
+# which rows are new, so when workers race on a job exactly one of them sees it as new.
+def upsert_new_jobs(session: Session, rows: list[dict]) -> set[str]:
+    rows = _dedupe(rows)
+    if not rows:
+        return set()
+    begin_write(session)
+    with UPSERT_BATCH_SECONDS.time():
+        insert = _INSERTS.get(session.get_bind().dialect.name)
+        if insert is None:
+            inserted = set()
+            for row in rows:
+                job = session.get(Job, row["id"])
+                if job is None:
+                    inserted.add(row["id"])
+                    session.add(Job(**row))
+                    continue
+                for column, value in row.items():
+                    if column not in _KEPT_ON_UPDATE:
+                        setattr(job, column, value)
+        else:
+            # executemany form: the statement compiles once (and is cached) and SQLAlchemy
+            # batches the parameter sets itself, unlike a giant multi-row .values(rows).
+            # Core (table) statements: the ORM's bulk-insert-with-RETURNING path is several times slower.
+            table = Job.__table__
+            stmt = insert(table)
+            inserted = set(session.execute(stmt.on_conflict_do_nothing(index_elements=[table.c.id]).returning(table.c.id), rows).scalars())
+            existing = [r for r in rows if r["id"] not in inserted]
+            if existing:
+                # `domain` stays as first stored: budget sketches were keyed by it at first sighting.
+                updates = {c: stmt.excluded[c] for c in rows[0] if c not in _KEPT_ON_UPDATE}
+                session.execute(stmt.on_conflict_do_update(index_elements=[table.c.id], set_=updates), existing)
+        if inserted:
+            # Re-fetched after archiving: new to the hot table, but not a first sighting.
+            inserted -= set(session.scalars(select(JobArchive.id).where(JobArchive.id.in_(inserted))))
+    return inserted
+
+# PURPOSE: Insert-or-update jobs by Upwork ID in as few round trips as the dialect allows.
+def upsert_jobs(session: Session, rows: list[dict]) -> int:
+    upsert_new_jobs(session, rows)
+    session.commit()
+    return len({r["id"] for r in rows})
+
+# Columns served by list endpoints; present in both the hot and archive tables.
+SUMMARY_COLUMNS = (
+    "id", "title", "domain", "budget_min", "budget_max", "currency",
+    "budget_type", "budget_min_base", "budget_max_base",
+    "verified_client", "location", "posted_date", "proposals",
+)
+
+def _summary_select(model, domain: str | None):
+    stmt = select(*(getattr(model, c) for c in SUMMARY_COLUMNS))
+    if domain:
+        stmt = stmt.where(model.domain == domain)
+    return stmt
+
+# A job re-fetched after archiving lives in both tables; the hot copy wins.
+def not_in_hot_table():
+    return ~select(Job.id).where(Job.id == JobArchive.id).exists()
+
+# PURPOSE: Newest-first page of jobs, optionally filtered by domain and spanning the archive.
+def list_jobs(
+    session: Session,
+    domain: str | None = None,
+    limit: int = 50,
+    offset: int = 0,
+    include_archived: bool = False,
+) -> list[dict]:
+    stmt = _summary_select(Job, domain)
+    if include_archived:
+        both = union_all(stmt, _summary_select(JobArchive, domain).where(not_in_hot_table())).subquery()
+        stmt = select(both).order_by(both.c.posted_date.desc(), both.c.id)
+    else:
+        stmt = stmt.order_by(Job.posted_date.desc(), Job.id)
+    return [dict(r) for r in session.execute(stmt.limit(limit).offset(offset)).mappings()]
+
+# PURPOSE: Full job record from the hot table, falling back to the (decompressed) archive.
+def get_job(session: Session, job_id: str) -> dict | None:
+    job = session.get(Job, job_id)
+    if job is not None:
+        row = {c: getattr(job, c) for c in SUMMARY_COLUMNS}
+        row.update(description=job.description, json_raw=job.json_raw, archived=False)
+        return row
+    archived = session.scalars(select(JobArchive).where(JobArchive.id == job_id)).first()
+    if archived is None:
+        return None
+    row = {c: getattr(archived, c) for c in SUMMARY_COLUMNS}
+    payload = decompress_payload(archived.payload)
+    row.update(description=payload.get("description"), json_raw=payload.get("json_raw"), archived=True)
+    return row
+
+# PURPOSE: Per-domain counts and average budgets across hot and archived jobs.
+def job_stats(session: Session, include_archived: bool = True) -> list[dict]:
+    source = select(Job.id, Job.domain, Job.budget_min, Job.budget_max)
+    if include_archived:
+        archived = select(JobArchive.id, JobArchive.domain, JobArchive.budget_min, JobArchive.budget_max)
+        source = union_all(source, archived.where(not_in_hot_table()))
+    src = source.subquery()
+    stmt = (
+        select(
+            src.c.domain,
+            func.count(src.c.id),
+            func.avg(src.c.budget_min),
+            func.avg(src.c.budget_max),
+        )
+        .group_by(src.c.domain)
+        .order_by(func.count(src.c.id).desc())
+    )
+    return [
+        {"domain": domain, "jobs": count, "avg_budget_min": avg_min, "avg_budget_max": avg_max}
+        for domain, count, avg_min, avg_max in session.execute(stmt)
+    ]
@@ -0,0 +1,208 @@
+"""PURPOSE: Maintain and query per domain x skill x month budget quantile sketches.
+"""
+
+
+import argparse
+from collections import defaultdict
+from datetime import date, datetime
+
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.jobs.budget import budget_value, normalize_budgets
+from app.jobs.skills import extract_skills
+from app.storage.archive import decompress_payload, month_start
+from app.storage.db import begin_write
+from app.storage.models import BudgetSketch, Job, JobArchive
+from app.storage.repository import not_in_hot_table
+from app.utils.logging import get_logger
+from app.utils.metrics import histogram
+from app.utils.sketch import QuantileSketch
+
+ALL_SKILLS = "*"
+UNCLASSIFIED = "unclassified"
+MAX_MERGE_ATTEMPTS = 5
+
+REBUILD_BATCH_SIZE = 1000
+
+logger = get_logger(__name__)
+
+SKETCH_UPDATE_SECONDS = histogram("budget_sketch_update_seconds", "Time to fold one batch of jobs into budget sketches")
+
+def _group_values(rows: list[dict]) -> dict[tuple, list[float]]:
+    groups: dict[tuple, list[float]] = defaultdict(list)
+    for row in rows:
+        value = budget_value(row)
+        if value is None or not row.get("budget_type"):
+            continue
+        month = month_start(row.get("posted_date") or datetime.utcnow())
+        domain = row.get("domain") or UNCLASSIFIED
+        skills = extract_skills(f"{row.get('title') or ''}\n{row.get('description') or ''}")
+        for skill in [ALL_SKILLS, *skills]:
+            groups[(domain, skill, month, row["budget_type"])].append(value)
+    return groups
+
+class _Conflict(Exception):
+    pass
+
+_PK = ("domain", "skill", "month", "budget_type", "currency")
+
+# PURPOSE: Fold newly ingested jobs (normalized rows, see jobs/budget.py) into their sketches.
+# Read-merge-write guarded by a per-sketch version; a concurrent writer makes the batch retry from a
+# savepoint, so work done earlier in the transaction survives. `commit=False` leaves the commit to
+# the caller, e.g. to commit the jobs and the sketch merge together (see jobs/fetcher.py).
+def record_budgets(session: Session, rows: list[dict], currency: str, commit: bool = True) -> int:
+    groups = _group_values(rows)
+    if not groups:
+        return 0
+    deltas = {}
+    for key, values in groups.items():
+        delta = deltas[(*key, currency)] = QuantileSketch()
+        delta.add_many(values)
+    t = BudgetSketch.__table__
+    current_stmt = select(*(t.c[c] for c in _PK), t.c.version, t.c.sketch).where(
+        t.c.domain.in_({k[0] for k in deltas}),
+        t.c.skill.in_({k[1] for k in deltas}),
+        t.c.month.in_({k[2] for k in deltas}),
+        t.c.currency == currency,
+    )
+    cas = (
+        update(t)
+        .where(*(t.c[c] == bindparam(f"k_{c}") for c in _PK), t.c.version == bindparam("k_version"))
+        .values(count=bindparam("count"), sketch=bindparam("sketch"), version=bindparam("version"), updated_at=bindparam("updated_at"))
+    )
+    # Batch the compare-and-set only where the driver reports executemany rowcounts reliably.
+    batch_updates = session.get_bind().dialect.supports_sane_multi_rowcount
+
+    with SKETCH_UPDATE_SECONDS.time():
+        begin_write(session)
+        for _ in range(MAX_MERGE_ATTEMPTS):
+            savepoint = session.begin_nested()
+            try:
+                existing = {tuple(r[:len(_PK)]): r for r in session.execute(current_stmt)}
+                now = datetime.utcnow()
+                inserts, updates = [], []
+                # Sorted keys: concurrent writers lock sketch rows in the same order.
+                for key, delta in sorted(deltas.items()):
+                    found = existing.get(key)
+                    if found is None:
+                        inserts.append(dict(zip(_PK, key), count=delta.count,
+                                            sketch=delta.to_dict(), version=0, updated_at=now))
+                        continue
+                    merged = QuantileSketch.from_dict(found.sketch).merge(delta)
+                    updates.append({
+                        **{f"k_{c}": v for c, v in zip(_PK, key)}, "k_version": found.version,
+                        "count": merged.count, "sketch": merged.to_dict(), "version": found.version + 1, "updated_at": now,
+                    })
+                if inserts:
+                    session.execute(insert(t), inserts)
+                if updates and batch_updates:
+                    if session.execute(cas, updates).rowcount != len(updates):
+                        raise _Conflict()
+                elif updates:
+                    for params in updates:
+                        if session.execute(cas, params).rowcount != 1:
+                            raise _Conflict()
+                savepoint.commit()
+                if commit:
+                    session.commit()
+                return len(deltas)
+            except (_Conflict, IntegrityError):
+                savepoint.rollback()
+    raise RuntimeError(f"budget sketch update kept conflicting after {MAX_MERGE_ATTEMPTS} attempts")
+
+def _round(value: float | None) -> float | None:
+    return None if value is None else round(value, 2)
+
+# PURPOSE: Budget quantiles per (domain, budget_type), merged over the selected skill and months.
+# Only sketches kept in `currency` (default BASE_CURRENCY) are merged; values in other currencies
+# are not comparable.
+def budget_quantiles(
+    session: Session,
+    domain: str | None = None,
+    skill: str = ALL_SKILLS,
+    budget_type: str | None = None,
+    since: date | None = None,
+    until: date | None = None,
+    quantiles: tuple[float, ...] = (0.5, 0.9),
+    currency: str | None = None,
+) -> list[dict]:
+    currency = currency or settings.base_currency
+    stmt = select(BudgetSketch).where(BudgetSketch.skill == skill, BudgetSketch.currency == currency)
+    if domain:
+        stmt = stmt.where(BudgetSketch.domain == domain)
+    if budget_type:
+        stmt = stmt.where(BudgetSketch.budget_type == budget_type)
+    if since:
+        stmt = stmt.where(BudgetSketch.month >= month_start(since))
+    if until:
+        stmt = stmt.where(BudgetSketch.month <= month_start(until))
+
+    merged: dict[tuple[str, str], QuantileSketch] = {}
+    for row in session.scalars(stmt):
+        key = (row.domain, row.budget_type)
+        sketch = QuantileSketch.from_dict(row.sketch)
+        merged[key] = merged[key].merge(sketch) if key in merged else sketch
+    return [
+        {
+            "domain": d,
+            "skill": skill,
+            "budget_type": t,
+            "currency": currency,
+            "count": s.count,
+            "quantiles": {f"p{q * 100:g}": _round(s.quantile(q)) for q in quantiles},
+        }
+        for (d, t), s in sorted(merged.items())
+    ]
+
+_BUDGET_COLUMNS = ("id", "title", "domain", "budget_min", "budget_max", "currency", "budget_type", "posted_date", "created_at")
+
+def _batches(session: Session, model, batch_size: int):
+    # Keyset pagination by id; yields job rows as dicts with the description filled in.
+    body = model.description if model is Job else model.payload
+    stmt = select(*(getattr(model, c) for c in _BUDGET_COLUMNS), body.label("body")).order_by(model.id).limit(batch_size)
+    if model is JobArchive:
+        stmt = stmt.where(not_in_hot_table())
+    last_id = None
+    while True:
+        page = session.execute(stmt if last_id is None else stmt.where(model.id > last_id)).mappings().all()
+        if not page:
+            return
+        rows = []
+        for r in page:
+            row = {c: r[c] for c in _BUDGET_COLUMNS}
+            row["description"] = r["body"] if model is Job else decompress_payload(r["body"]).get("description")
+            row["posted_date"] = row["posted_date"] or row["created_at"]
+            rows.append(row)
+        yield rows
+        last_id = page[-1]["id"]
+
+# PURPOSE: Recompute every sketch in `currency` from jobs + jobs_archive, in one transaction.
+# Budgets are re-converted from the original amounts, so this also re-bases stored figures after
+# BASE_CURRENCY changes. Stop ingestion while it runs: jobs stored meanwhile could be missed or
+# counted twice.
+def rebuild_budget_sketches(session: Session, currency: str | None = None, batch_size: int = REBUILD_BATCH_SIZE) -> int:
+    currency = currency or settings.base_currency
+    begin_write(session)
+    session.execute(delete(BudgetSketch).where(BudgetSketch.currency == currency))
+    jobs = 0
+    for model in (Job, JobArchive):
+        for rows in _batches(session, model, batch_size):
+            record_budgets(session, normalize_budgets(rows, currency), currency, commit=False)
+            jobs += len(rows)
+    session.commit()
+    return jobs
+
+if __name__ == "__main__":
+    from app.jobs.budget import check_base_currency
+    from app.storage.db import SessionLocal, init_db
+
+    parser = argparse.ArgumentParser(description="Rebuild budget sketches from jobs and jobs_archive")
+    parser.add_argument("--currency", default=settings.base_currency, help="Currency to rebuild (default: BASE_CURRENCY)")
+    args = parser.parse_args()
+    check_base_currency(args.currency)
+    init_db()
+    with SessionLocal() as session:
+        logger.info("rebuilt %s budget sketches from %s jobs", args.currency, rebuild_budget_sketches(session, args.currency))
@@ -2,14 +2,44 @@
 """
 
 
+import json
 import logging
+import os
+from datetime import datetime, timezone
+
+# Attributes every LogRecord carries; anything else arrived via `extra=` and is emitted as a field.
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+# PURPOSE: One JSON object per line, so log shippers can index fields like `elapsed_ms`.
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
 
 # PURPOSE: Configure simple structured logging; replace with loguru or structlog if preferred.
-def get_logger(name: str = "app"):
+# Set LOG_FORMAT=json to emit JSON lines instead of plain text.
+def get_logger(name: str = "app", json_format: bool | None = None):
     logger = logging.getLogger(name)
     if not logger.handlers:
+        if json_format is None:
+            json_format = os.getenv("LOG_FORMAT", "text").lower() == "json"
         handler = logging.StreamHandler()
-        fmt = logging.Formatter("[%(asctime)s] %(levelname)s %(name)s: %(message)s")
+        if json_format:
+            fmt = JsonFormatter()
+        else:
+            fmt = logging.Formatter("[%(asctime)s] %(levelname)s %(name)s: %(message)s")
         handler.setFormatter(fmt)
         logger.addHandler(handler)
         logger.setLevel(logging.INFO)
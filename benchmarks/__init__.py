@@ -0,0 +1,2 @@
+"""PURPOSE: Reproducible performance benchmarks (synthetic data, mock Upwork API, runner).
+"""
@@ -0,0 +1,130 @@
+"""PURPOSE: Local mock of the Upwork GraphQL search endpoint with pagination, injected 429s and latency.
+"""
+
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_TERM = re.compile(r'"([^"]+)"')
+
+class MockUpworkServer:
+    # Serves `jobs` (GraphQL job nodes) on http://127.0.0.1:<port>/graphql.
+    # Every `rate_limit_every`-th request gets a 429 with `Retry-After: retry_after`,
+    # and every response is delayed by `latency` seconds. Use as a context manager.
+    def __init__(
+        self,
+        jobs: list[dict],
+        latency: float = 0.0,
+        rate_limit_every: int = 0,
+        retry_after: float = 0.01,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.jobs = jobs
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.requests = 0
+        self.rate_limited = 0
+        self._lock = threading.Lock()
+        self._matches: dict[str, list[dict]] = {}
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/graphql"
+
+    def start(self) -> "MockUpworkServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockUpworkServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def matching(self, expression: str) -> list[dict]:
+        # Quoted terms are OR-ed, case-insensitive, against title + description.
+        with self._lock:
+            cached = self._matches.get(expression)
+        if cached is not None:
+            return cached
+        terms = [t.lower() for t in _TERM.findall(expression)] or [expression.lower()]
+        found = [
+            j for j in self.jobs
+            if any(t in f"{j.get('title') or ''} {j.get('description') or ''}".lower() for t in terms)
+        ]
+        with self._lock:
+            self._matches[expression] = found
+        return found
+
+    def _next_request_limited(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            limited = bool(self.rate_limit_every) and self.requests % self.rate_limit_every == 0
+            if limited:
+                self.rate_limited += 1
+            return limited
+
+    def _page(self, variables: dict) -> dict:
+        flt = variables.get("filter") or {}
+        pagination = flt.get("pagination_eq") or {}
+        first = int(pagination.get("first") or 10)
+        start = int(pagination.get("after") or 0)
+        found = self.matching(flt.get("searchExpression_eq") or "")
+        end = min(start + first, len(found))
+        return {
+            "data": {
+                "marketplaceJobPostingsSearch": {
+                    "totalCount": len(found),
+                    "edges": [{"node": node} for node in found[start:end]],
+                    "pageInfo": {"hasNextPage": end < len(found), "endCursor": str(end)},
+                }
+            }
+        }
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: dict, headers: dict | None = None):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if mock.latency:
+                    time.sleep(mock.latency)
+                if mock._next_request_limited():
+                    self._send(429, {"errors": [{"message": "rate limited"}]}, {"Retry-After": str(mock.retry_after)})
+                    return
+                if not self.headers.get("Authorization", "").startswith("Bearer "):
+                    self._send(401, {"errors": [{"message": "missing bearer token"}]})
+                    return
+                self._send(200, mock._page(payload.get("variables") or {}))
+
+        return Handler
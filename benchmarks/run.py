@@ -0,0 +1,122 @@
+"""PURPOSE: Benchmark runner: time each case, write results JSON, compare against a saved baseline.
+
+Usage:
+  python -m benchmarks.run                              # run all, write benchmarks/results/latest.json
+  python -m benchmarks.run --save-baseline              # also store as the baseline
+  python -m benchmarks.run --only classify --repeat 10  # subset
+  python -m benchmarks.run --threshold 0.15             # fail if median is >15% slower than baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+DEFAULT_OUTPUT = RESULTS_DIR / "latest.json"
+DEFAULT_BASELINE = RESULTS_DIR / "baseline.json"
+
+
+def run_benchmark(bench, repeat: int, scale: float) -> dict:
+    timings, ops = [], 0
+    for _ in range(repeat):
+        state = bench.setup(scale)
+        try:
+            start = time.perf_counter()
+            ops = bench.run(state)
+            timings.append(time.perf_counter() - start)
+        finally:
+            bench.teardown(state)
+    timings.sort()
+    median = statistics.median(timings)
+    return {
+        "repeat": repeat,
+        "ops": ops,
+        "min_s": timings[0],
+        "median_s": median,
+        "mean_s": statistics.fmean(timings),
+        "p95_s": timings[min(len(timings) - 1, int(round(0.95 * (len(timings) - 1))))],
+        "ops_per_s": ops / median if median else None,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[dict]:
+    # One row per benchmark present in both; `regressed` when median grew by more than `threshold`.
+    rows = []
+    for name, result in current["benchmarks"].items():
+        base = baseline.get("benchmarks", {}).get(name)
+        if not base or not base.get("median_s"):
+            continue
+        ratio = result["median_s"] / base["median_s"]
+        rows.append({
+            "name": name,
+            "baseline_s": base["median_s"],
+            "current_s": result["median_s"],
+            "ratio": ratio,
+            "regressed": ratio > 1 + threshold,
+        })
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    from benchmarks.suite import BENCHMARKS
+
+    p = argparse.ArgumentParser(description="Run performance benchmarks")
+    p.add_argument("--only", nargs="*", help="Benchmark names to run (default: all)")
+    p.add_argument("--repeat", type=int, default=5, help="Timed repetitions per benchmark (default: 5)")
+    p.add_argument("--scale", type=float, default=1.0, help="Multiply dataset sizes (default: 1.0)")
+    p.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="Where to write results JSON")
+    p.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    p.add_argument("--save-baseline", action="store_true", help="Also write results to --baseline")
+    p.add_argument("--threshold", type=float, default=0.2, help="Allowed median slowdown ratio (default: 0.2)")
+    args = p.parse_args(argv)
+
+    selected = [b for b in BENCHMARKS if not args.only or b.name in args.only]
+    unknown = set(args.only or []) - {b.name for b in BENCHMARKS}
+    if unknown:
+        raise SystemExit(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "scale": args.scale,
+        },
+        "benchmarks": {},
+    }
+    for bench in selected:
+        r = run_benchmark(bench, args.repeat, args.scale)
+        results["benchmarks"][bench.name] = r
+        print(f"{bench.name:<24} median {r['median_s'] * 1000:9.2f} ms  ({r['ops']} ops, {r['ops_per_s'] or 0:,.0f} ops/s)")
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"Wrote {args.output}")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Saved baseline {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print("No baseline found; run with --save-baseline to create one.")
+        return 0
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    rows = compare(results, baseline, args.threshold)
+    for row in rows:
+        flag = "REGRESSION" if row["regressed"] else "ok"
+        print(f"{row['name']:<24} {row['baseline_s'] * 1000:9.2f} -> {row['current_s'] * 1000:9.2f} ms  x{row['ratio']:.2f}  {flag}")
+    return 1 if any(r["regressed"] for r in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""PURPOSE: Benchmark cases for classifier, bulk upsert, end-to-end and leased-worker fetch, and the /jobs, /stats, /stats/budgets endpoints.
+"""
+
+
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.api.main import app
+from app.jobs.budget import normalize_budgets
+from app.jobs.classifier import classify
+from app.jobs.fetcher import fetch_and_store, to_row
+from app.scheduler.leases import register_searches
+from app.storage.db import get_session, init_db, make_engine, sqlite_session_factory
+from app.storage.models import Base
+from app.storage.repository import upsert_jobs
+from app.storage.sketches import record_budgets
+from benchmarks.mock_upwork import MockUpworkServer
+from benchmarks.synthetic import JobGenerator
+from benchmarks.workers import WorkerProcesses
+
+# PURPOSE: A named case: `setup(scale)` builds fresh state, `run(state)` is the timed part.
+@dataclass
+class Benchmark:
+    name: str
+    setup: Callable[[float], dict]
+    run: Callable[[dict], int]
+    teardown: Callable[[dict], None] = lambda state: None
+
+# Postgres cases run only when BENCH_DATABASE_URL names a scratch database (its tables are dropped).
+BENCH_DATABASE_URL = os.environ.get("BENCH_DATABASE_URL")
+
+def _fresh_db(state: dict, database_url: str | None = None) -> dict:
+    if database_url:
+        state["engine"] = make_engine(database_url)
+        Base.metadata.drop_all(state["engine"])
+        init_db(state["engine"])
+        state["session_factory"] = sessionmaker(bind=state["engine"], autoflush=False, autocommit=False, future=True)
+        return state
+    state["tmp"] = tempfile.TemporaryDirectory()
+    state["engine"], state["session_factory"] = sqlite_session_factory(Path(state["tmp"].name) / "bench.db")
+    return state
+
+def _drop_db(state: dict) -> None:
+    state["engine"].dispose()
+    if "tmp" in state:
+        state["tmp"].cleanup()
+
+# --- classifier -------------------------------------------------------------
+
+def _classify_setup(scale: float) -> dict:
+    jobs = JobGenerator(seed=1).jobs(int(5000 * scale))
+    return {"texts": [f"{j['title']}\n{j['description']}" for j in jobs]}
+
+def _classify_run(state: dict) -> int:
+    for text in state["texts"]:
+        classify(text)
+    return len(state["texts"])
+
+# --- bulk upsert ------------------------------------------------------------
+
+def _upsert_setup(scale: float) -> dict:
+    rows = [to_row(node) for node in JobGenerator(seed=2).jobs(int(5000 * scale))]
+    return _fresh_db({"rows": rows})
+
+def _upsert_run(state: dict) -> int:
+    with state["session_factory"]() as session:
+        return upsert_jobs(session, state["rows"])
+
+# --- end-to-end fetch_and_store against the mock API ------------------------
+
+def _fetch_setup(scale: float, database_url: str | None = None) -> dict:
+    server = MockUpworkServer(JobGenerator(seed=3).jobs(int(3000 * scale)), latency=0.002, rate_limit_every=25).start()
+    return _fresh_db({"server": server}, database_url)
+
+def _fetch_run(state: dict) -> int:
+    return fetch_and_store(
+        session_factory=state["session_factory"], token="bench", api_url=state["server"].url, page_size=50,
+    )
+
+def _fetch_teardown(state: dict) -> None:
+    state["server"].stop()
+    _drop_db(state)
+
+# --- leased multi-worker ingestion (one OS process per worker, shared SQLite file or Postgres) ---
+
+def _workers_setup(workers: int, database_url: str | None = None):
+    def setup(scale: float) -> dict:
+        state = _fetch_setup(scale, database_url)
+        with state["session_factory"]() as session:
+            # One saved search per taxonomy skill, as a stand-in for many user searches.
+            register_searches(session, {f"skill:{name}": f'"{name}"' for name, _ in JobGenerator().vocab})
+        state["workers"] = WorkerProcesses(state["engine"].url.render_as_string(hide_password=False), state["server"].url, workers)
+        return state
+    return setup
+
+def _workers_run(state: dict) -> int:
+    return state["workers"].run()
+
+def _workers_teardown(state: dict) -> None:
+    state["workers"].stop()
+    _fetch_teardown(state)
+
+# --- API endpoints ----------------------------------------------------------
+
+def _api_setup(scale: float) -> dict:
+    state = _fresh_db({"requests": max(1, int(50 * scale))})
+    rows = normalize_budgets([to_row(node) for node in JobGenerator(seed=4).jobs(int(5000 * scale))])
+    with state["session_factory"]() as session:
+        upsert_jobs(session, rows)
+        record_budgets(session, rows, "USD")
+
+    def override():
+        session = state["session_factory"]()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_session] = override
+    state["client"] = TestClient(app)
+    return state
+
+def _api_teardown(state: dict) -> None:
+    app.dependency_overrides.pop(get_session, None)
+    _drop_db(state)
+
+def _get_many(path: str):
+    def run(state: dict) -> int:
+        for _ in range(state["requests"]):
+            state["client"].get(path).raise_for_status()
+        return state["requests"]
+    return run
+
+BENCHMARKS = [
+    Benchmark("classify", _classify_setup, _classify_run),
+    Benchmark("upsert_bulk", _upsert_setup, _upsert_run, _drop_db),
+    Benchmark("fetch_and_store_e2e", _fetch_setup, _fetch_run, _fetch_teardown),
+    *(
+        Benchmark(f"leased_workers_{n}", _workers_setup(n), _workers_run, _workers_teardown)
+        for n in (1, 2, 4)
+    ),
+    *(
+        Benchmark(f"leased_workers_pg_{n}", _workers_setup(n, BENCH_DATABASE_URL), _workers_run, _workers_teardown)
+        for n in ((1, 2, 4) if BENCH_DATABASE_URL else ())
+    ),
+    Benchmark("api_jobs", _api_setup, _get_many("/jobs?limit=100"), _api_teardown),
+    Benchmark("api_stats", _api_setup, _get_many("/stats"), _api_teardown),
+    Benchmark("api_stats_budgets", _api_setup, _get_many("/stats/budgets?budget_type=hourly&q=0.5&q=0.9"), _api_teardown),
+]
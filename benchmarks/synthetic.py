@@ -0,0 +1,87 @@
+"""PURPOSE: Seeded generator of realistic Upwork-shaped job postings drawn from the skill taxonomy.
+"""
+
+
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from app.jobs.skills import TAXONOMY_DIR, load_taxonomy
+
+TITLE_TEMPLATES = [
+    "{skill} engineer needed for {project}",
+    "Build {project} with {skill}",
+    "Senior {skill} developer ({alias})",
+    "Help us ship {project} using {skill} and {other}",
+    "{alias} expert for {project}",
+]
+PROJECTS = [
+    "a customer support assistant", "an internal search tool", "a document Q&A bot",
+    "a demand forecasting model", "a defect detection pipeline", "a churn prediction model",
+    "a data labeling workflow", "an analytics dashboard", "a recommendation engine",
+]
+FILLER = [
+    "We are a small startup moving fast.", "Long-term work is possible for the right person.",
+    "Please include links to similar work.", "Timezone overlap with US hours is preferred.",
+    "NDA required before sharing data.", "Clear communication is a must.",
+]
+COUNTRIES = ["United States", "United Kingdom", "Germany", "India", "Canada", "Australia", "Netherlands"]
+CURRENCIES = ["USD", "USD", "USD", "EUR", "GBP"]
+
+# PURPOSE: (canonical name, surface forms) pairs for the generator; keywords count as mentions too.
+def load_vocabulary(taxonomy_dir: Path = TAXONOMY_DIR) -> list[tuple[str, list[str]]]:
+    return [
+        (name, sorted({*entry["aliases"], *entry["keywords"]}) or [name])
+        for name, entry in sorted(load_taxonomy(taxonomy_dir).items())
+    ]
+
+class JobGenerator:
+    # Same seed -> same postings, so benchmark inputs are stable across runs and machines.
+    def __init__(self, seed: int = 42, taxonomy_dir: Path = TAXONOMY_DIR, now: datetime | None = None):
+        self.rng = random.Random(seed)
+        self.vocab = load_vocabulary(taxonomy_dir)
+        self.now = now or datetime(2025, 10, 1)
+        self._counter = 0
+
+    def _money(self, low: int, high: int, currency: str) -> dict:
+        return {"rawValue": str(self.rng.randint(low, high)), "currency": currency}
+
+    def job(self) -> dict:
+        rng = self.rng
+        self._counter += 1
+        (skill, forms), (other, other_forms) = rng.sample(self.vocab, 2)
+        alias = rng.choice(forms)
+        title = rng.choice(TITLE_TEMPLATES).format(
+            skill=skill, alias=alias, other=other, project=rng.choice(PROJECTS)
+        )
+        mentions = [skill, alias, other, rng.choice(other_forms)] + [rng.choice(f) for _, f in rng.sample(self.vocab, 3)]
+        rng.shuffle(mentions)
+        description = " ".join(
+            [f"Looking for experience with {', '.join(mentions[:-1])} and {mentions[-1]}."]
+            + rng.sample(FILLER, rng.randint(1, 4))
+        )
+        currency = rng.choice(CURRENCIES)
+        node = {
+            "id": f"~01{self._counter:016d}",
+            "title": title,
+            "description": description,
+            "createdDateTime": (self.now - timedelta(minutes=rng.randint(0, 60 * 24 * 90))).isoformat() + "Z",
+            "totalApplicants": rng.randint(0, 50),
+            "amount": None,
+            "hourlyBudgetMin": None,
+            "hourlyBudgetMax": None,
+            "client": {
+                "verificationStatus": "VERIFIED" if rng.random() < 0.7 else "NOT_VERIFIED",
+                "location": {"country": rng.choice(COUNTRIES)},
+            },
+        }
+        if rng.random() < 0.5:
+            low = rng.randint(15, 80)
+            node["hourlyBudgetMin"] = {"rawValue": str(low), "currency": currency}
+            node["hourlyBudgetMax"] = self._money(low, low + 60, currency)
+        else:
+            node["amount"] = self._money(100, 20000, currency)
+        return node
+
+    def jobs(self, n: int) -> list[dict]:
+        return [self.job() for _ in range(n)]
@@ -0,0 +1,70 @@
+"""PURPOSE: Run leased ingestion workers as separate OS processes against one database file.
+"""
+
+
+import asyncio
+import multiprocessing
+
+from sqlalchemy.orm import sessionmaker
+
+from app.clients.ratelimit import SharedTokenBucket
+from app.scheduler.cron import run_worker_async
+from app.storage.db import make_engine
+
+START_TIMEOUT_SECONDS = 60
+RUN_TIMEOUT_SECONDS = 600
+
+def _worker_main(database_url: str, api_url: str, worker_id: str, go, results, rate: float, capacity: int, batch: int, page_size: int) -> None:
+    # Import and connect before reporting ready, so the timed part is ingestion only.
+    engine = make_engine(database_url)
+    session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+    limiter = SharedTokenBucket(session_factory, "upwork", rate=rate, capacity=capacity, batch=batch)
+    results.put(("ready", worker_id))
+    go.wait()
+    try:
+        stored = asyncio.run(run_worker_async(
+            worker_id, session_factory, "bench", api_url=api_url, rate_limiter=limiter, page_size=page_size, drain=True,
+        ))
+        results.put(("done", stored))
+    except BaseException as exc:
+        results.put(("error", f"{worker_id}: {exc!r}"))
+    finally:
+        engine.dispose()
+
+# PURPOSE: Spawned, idle worker processes; `run()` releases them together and sums what they stored.
+class WorkerProcesses:
+    def __init__(
+        self, database_url: str, api_url: str, workers: int, *,
+        rate: float = 10_000, capacity: int = 100, batch: int = 5, page_size: int = 50,
+    ):
+        ctx = multiprocessing.get_context("spawn")
+        self._go = ctx.Event()
+        self._results = ctx.Queue()
+        self._procs = [
+            ctx.Process(
+                target=_worker_main,
+                args=(database_url, api_url, f"proc-{i}", self._go, self._results, rate, capacity, batch, page_size),
+                daemon=True,
+            )
+            for i in range(workers)
+        ]
+        for proc in self._procs:
+            proc.start()
+        for _ in self._procs:
+            self._results.get(timeout=START_TIMEOUT_SECONDS)
+
+    def run(self) -> int:
+        self._go.set()
+        outcomes = [self._results.get(timeout=RUN_TIMEOUT_SECONDS) for _ in self._procs]
+        for proc in self._procs:
+            proc.join()
+        errors = [value for kind, value in outcomes if kind == "error"]
+        if errors:
+            raise RuntimeError(f"worker processes failed: {errors}")
+        return sum(value for _, value in outcomes)
+
+    def stop(self) -> None:
+        for proc in self._procs:
+            if proc.is_alive():
+                proc.terminate()
+            proc.join()
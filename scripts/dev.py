@@ -7,12 +7,14 @@ Commands:
   - api          Run FastAPI app via uvicorn
   - scheduler    Run scheduler entrypoint
   - test         Run pytest
+  - bench        Run benchmarks and compare against the saved baseline
 
 Usage examples:
   python scripts/dev.py setup
   python scripts/dev.py api --port 8000 --reload
   python scripts/dev.py scheduler
   python scripts/dev.py test
+  python scripts/dev.py bench --save-baseline
 """
 
 from __future__ import annotations
@@ -125,6 +127,18 @@ def cmd_test(_args: argparse.Namespace) -> None:
     run([str(py), "-m", "pytest", "-q"])
 
 
+def cmd_bench(args: argparse.Namespace) -> None:
+    py = venv_python()
+    if not py.exists():
+        raise SystemExit("Venv not found. Run 'python scripts/dev.py setup' first.")
+    bench_args = ["--repeat", str(args.repeat), "--threshold", str(args.threshold)]
+    if args.only:
+        bench_args += ["--only", *args.only]
+    if args.save_baseline:
+        bench_args.append("--save-baseline")
+    run([str(py), "-m", "benchmarks.run", *bench_args])
+
+
 def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(description="Dev utility for running the service")
     sub = p.add_subparsers(dest="command", required=True)
@@ -144,6 +158,13 @@ def build_parser() -> argparse.ArgumentParser:
     s_test = sub.add_parser("test", help="Run pytest")
     s_test.set_defaults(func=cmd_test)
 
+    s_bench = sub.add_parser("bench", help="Run benchmarks and compare against the baseline")
+    s_bench.add_argument("--only", nargs="*", help="Benchmark names to run (default: all)")
+    s_bench.add_argument("--repeat", type=int, default=5, help="Timed repetitions (default: 5)")
+    s_bench.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown ratio (default: 0.2)")
+    s_bench.add_argument("--save-baseline", action="store_true", help="Store results as the new baseline")
+    s_bench.set_defaults(func=cmd_bench)
+
     return p
 
 
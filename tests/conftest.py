@@ -0,0 +1,32 @@
+"""PURPOSE: Shared pytest fixtures.
+"""
+
+
+import os
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.storage.db import init_db, make_engine, sqlite_session_factory
+from app.storage.models import Base
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine, factory = sqlite_session_factory(tmp_path / "test.db")
+    yield factory
+    engine.dispose()
+
+
+# Postgres-only paths (SKIP LOCKED claims, partitions) run when TEST_DATABASE_URL points at a
+# scratch database, e.g. postgresql+psycopg2://postgres@localhost/jobs_test; its tables are dropped.
+@pytest.fixture
+def pg_session_factory():
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    engine = make_engine(url)
+    Base.metadata.drop_all(engine)
+    init_db(engine)
+    yield sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+    engine.dispose()
@@ -0,0 +1,155 @@
+"""PURPOSE: Tests for hot/cold tiering of jobs and archive-aware queries.
+"""
+
+
+import asyncio
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select, text, update
+
+from app.api.main import app
+from app.jobs.fetcher import to_row
+from app.scheduler import cron
+from app.scheduler.cron import ARCHIVE_TASK, run_worker_async
+from app.scheduler.leases import register_searches
+from app.storage.archive import archive_jobs, compress_payload, decompress_payload, month_start
+from app.storage.db import get_session
+from app.storage.models import Job, JobArchive, SearchLease
+from app.storage.repository import get_job, job_stats, list_jobs, upsert_jobs, upsert_new_jobs
+from benchmarks.synthetic import JobGenerator
+
+NOW = datetime(2025, 10, 1)
+
+
+@pytest.fixture
+def session(session_factory):
+    with session_factory() as s:
+        # Synthetic postings span the 90 days before NOW.
+        upsert_jobs(s, [to_row(n) for n in JobGenerator(seed=5, now=NOW).jobs(100)])
+        yield s
+
+
+def test_payload_roundtrip():
+    data = {"description": "x" * 1000, "json_raw": {"id": "~01", "nested": [1, 2]}}
+    blob = compress_payload(data)
+    assert len(blob) < 200
+    assert decompress_payload(blob) == data
+
+
+def test_archive_moves_only_old_jobs(session):
+    cutoff = NOW - timedelta(days=30)
+    old = session.scalar(select(func.count(Job.id)).where(Job.posted_date < cutoff))
+    assert 0 < old < 100
+
+    assert archive_jobs(session, older_than_days=30, now=NOW, batch_size=7) == old
+    assert session.scalar(select(func.count(Job.id))) == 100 - old
+    assert session.scalar(select(func.count(JobArchive.id))) == old
+    assert session.scalar(select(func.min(Job.posted_date))) >= cutoff
+    archived = session.scalars(select(JobArchive)).first()
+    assert archived.archive_month == month_start(archived.posted_date)
+    # Idempotent once the hot table is below the cutoff.
+    assert archive_jobs(session, older_than_days=30, now=NOW) == 0
+
+
+def test_archived_jobs_stay_queryable(session):
+    before = job_stats(session)
+    oldest = list_jobs(session, limit=1, offset=99)[0]
+    archive_jobs(session, older_than_days=30, now=NOW)
+
+    assert len(list_jobs(session, limit=500)) < 100
+    assert len(list_jobs(session, limit=500, include_archived=True)) == 100
+    assert job_stats(session) == before
+    job = get_job(session, oldest["id"])
+    assert job["archived"] is True
+    assert job["description"] and job["json_raw"]["id"] == oldest["id"]
+
+
+def test_job_detail_endpoint_reads_archive(session):
+    oldest = list_jobs(session, limit=1, offset=99)[0]
+    archive_jobs(session, older_than_days=30, now=NOW)
+    app.dependency_overrides[get_session] = lambda: session
+    try:
+        client = TestClient(app)
+        assert client.get(f"/jobs/{oldest['id']}").json()["archived"] is True
+        assert client.get("/jobs/missing").status_code == 404
+        ids = {j["id"] for j in client.get("/jobs", params={"limit": 500, "include_archived": True}).json()}
+        assert oldest["id"] in ids
+    finally:
+        app.dependency_overrides.pop(get_session, None)
+
+
+def test_refetched_archived_jobs_are_counted_once(session):
+    before = job_stats(session)
+    archive_jobs(session, older_than_days=30, now=NOW)
+    archived = session.scalars(select(JobArchive.id)).all()
+    refetched = [to_row(n) for n in JobGenerator(seed=5, now=NOW).jobs(100) if n["id"] in set(archived)]
+    # Back in the hot table, but not a first sighting (budget sketches already hold them).
+    assert upsert_new_jobs(session, refetched) == set()
+    session.commit()
+
+    assert job_stats(session) == before
+    listed = list_jobs(session, limit=500, include_archived=True)
+    assert len(listed) == len({j["id"] for j in listed}) == 100
+
+
+def test_worker_runs_leased_archive_task(session, session_factory):
+    register_searches(session, {ARCHIVE_TASK: "archive_jobs"})
+    # Every synthetic posting is older than ARCHIVE_AFTER_DAYS relative to the real clock.
+    asyncio.run(run_worker_async("w1", session_factory, "t", api_url="http://unused", drain=True))
+    assert session.scalar(select(func.count(Job.id))) == 0
+    assert session.scalar(select(func.count(JobArchive.id))) == 100
+
+
+class StopAfter(threading.Event):
+    # Reports "set" from the `checks`-th check on, i.e. after `checks - 1` batches.
+    def __init__(self, checks: int):
+        super().__init__()
+        self.checks = checks
+
+    def is_set(self) -> bool:
+        self.checks -= 1
+        return self.checks <= 0 or super().is_set()
+
+
+def test_archive_stops_between_batches(session):
+    assert archive_jobs(session, 0, now=NOW, batch_size=10, stop=StopAfter(3)) == 20
+    assert session.scalar(select(func.count(JobArchive.id))) == 20
+    assert archive_jobs(session, 0, now=NOW, batch_size=10, stop=StopAfter(1)) == 0
+
+
+def test_lost_lease_stops_archive_thread(session, session_factory, monkeypatch):
+    register_searches(session, {ARCHIVE_TASK: "archive_jobs"})
+    seen = {}
+
+    def archive_taken_over(session, older_than_days, stop=None):
+        with session_factory() as other:  # another worker takes the lease over mid-run
+            other.execute(update(SearchLease).values(leased_by="w2", lease_expires_at=datetime.utcnow() + timedelta(hours=1)))
+            other.commit()
+        seen["stopped"] = stop.wait(timeout=5)
+        seen["thread_done"] = True
+        return 0
+
+    monkeypatch.setattr(cron, "archive_jobs", archive_taken_over)
+    asyncio.run(run_worker_async("w1", session_factory, "t", api_url="http://unused", lease_seconds=0.3, drain=True))
+    assert seen == {"stopped": True, "thread_done": True}
+    session.expire_all()
+    assert session.get(SearchLease, ARCHIVE_TASK).leased_by == "w2"
+
+
+def test_postgres_archive_lands_in_monthly_partitions(pg_session_factory):
+    rows = [to_row(n) for n in JobGenerator(seed=5, now=NOW).jobs(100)]
+    with pg_session_factory() as session:
+        upsert_jobs(session, rows)
+        assert archive_jobs(session, 0, now=NOW, batch_size=30) == 100
+        placed = dict(session.execute(text(
+            "SELECT tableoid::regclass::text, count(*) FROM jobs_archive GROUP BY 1"
+        )).all())
+        expected = {}
+        for r in rows:
+            name = f"jobs_archive_{month_start(r['posted_date']):%Y_%m}"
+            expected[name] = expected.get(name, 0) + 1
+        assert placed == expected
+        assert get_job(session, rows[0]["id"])["title"] == rows[0]["title"]
@@ -0,0 +1,157 @@
+"""PURPOSE: Tests for FX normalization, skill extraction, quantile sketches and budget stats.
+"""
+
+
+import random
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.api.main import app
+from app.jobs.budget import budget_value, check_base_currency, convert, normalize_budgets
+from app.jobs.fetcher import fetch_and_store
+from app.jobs.skills import extract_skills, load_taxonomy
+from app.scheduler.leases import register_searches
+from app.storage.archive import archive_jobs
+from app.storage.db import get_session
+from app.storage.models import BudgetSketch, Job
+from app.storage.sketches import ALL_SKILLS, budget_quantiles, rebuild_budget_sketches, record_budgets
+from app.utils.sketch import QuantileSketch
+from benchmarks.mock_upwork import MockUpworkServer
+from benchmarks.synthetic import JobGenerator
+from benchmarks.workers import WorkerProcesses
+
+RATES = {"USD": 1.0, "EUR": 1.2, "GBP": 1.5}
+
+
+def test_convert_batches_and_flags_unknown_currencies():
+    out = convert([100, 100, 100, 100], ["usd", "EUR", "GBP", "XYZ"], rates=RATES)
+    assert out[:3].tolist() == [100, 120, 150]
+    assert np.isnan(out[3])
+    assert convert([120], ["EUR"], base_currency="GBP", rates=RATES)[0] == pytest.approx(96)
+
+
+def test_base_currency_must_have_a_rate():
+    check_base_currency("eur", rates=RATES)
+    with pytest.raises(ValueError, match="XYZ"):
+        check_base_currency("XYZ", rates=RATES)
+
+
+def test_normalize_budgets_keeps_missing_values_missing():
+    rows = normalize_budgets(
+        [{"budget_min": 10, "budget_max": 20, "currency": "EUR"}, {"budget_min": None, "budget_max": 500, "currency": None}],
+        rates=RATES,
+    )
+    assert (rows[0]["budget_min_base"], rows[0]["budget_max_base"]) == (12, 24)
+    assert (rows[1]["budget_min_base"], rows[1]["budget_max_base"]) == (None, None)
+
+
+def test_extract_skills_maps_aliases_to_canonical_names():
+    assert extract_skills("LangChain agent on gpt4 with a vector db; sklearn baseline") == [
+        "GPT-4", "LangChain", "Vector Databases", "scikit-learn",
+    ]
+    assert extract_skills("Totally unrelated bakery website") == []
+
+
+def test_generator_and_extraction_share_the_taxonomy():
+    vocab = dict(JobGenerator().vocab)
+    assert set(vocab) == set(load_taxonomy())
+    for name in vocab:
+        assert extract_skills(name) == [name]
+
+
+def test_sketch_is_accurate_and_merge_is_order_independent():
+    rng = random.Random(0)
+    values = [rng.lognormvariate(6, 1) for _ in range(5000)]
+    parts = [QuantileSketch() for _ in range(3)]
+    for i, v in enumerate(values):
+        parts[i % 3].add(v)
+    ab_c = QuantileSketch().merge(parts[0]).merge(parts[1]).merge(parts[2])
+    c_ba = QuantileSketch().merge(parts[2]).merge(parts[1]).merge(parts[0])
+    assert ab_c.to_dict() == c_ba.to_dict()
+
+    exact = sorted(values)
+    for q in (0.5, 0.9, 0.99):
+        assert ab_c.quantile(q) == pytest.approx(exact[int(q * (len(exact) - 1))], rel=0.03)
+    assert QuantileSketch.from_dict(ab_c.to_dict()).quantile(0.5) == ab_c.quantile(0.5)
+
+
+def test_record_budgets_merges_across_batches(session_factory):
+    row = {"domain": "GenAI agents", "title": "LangChain bot", "budget_type": "hourly", "posted_date": date(2025, 9, 3)}
+    with session_factory() as session:
+        record_budgets(session, [dict(row, budget_min_base=40, budget_max_base=60)], "USD")
+        record_budgets(session, [dict(row, budget_min_base=100, budget_max_base=100)], "USD")
+        skills = {s.skill: s.count for s in session.scalars(select(BudgetSketch))}
+        assert skills == {"*": 2, "LangChain": 2}
+        [result] = budget_quantiles(session, domain="GenAI agents", skill="LangChain")
+        assert result["count"] == 2 and result["quantiles"]["p50"] == pytest.approx(50, rel=0.02)
+
+        # Sketches left behind by an earlier BASE_CURRENCY are not merged into the USD figures.
+        record_budgets(session, [dict(row, budget_min_base=9000, budget_max_base=9000)], "JPY")
+        [result] = budget_quantiles(session, domain="GenAI agents", skill="LangChain")
+        assert result["count"] == 2 and result["currency"] == "USD"
+        assert budget_quantiles(session, domain="GenAI agents", currency="JPY")[0]["count"] == 1
+
+
+def test_refetch_does_not_double_count_and_stats_serve_percentiles(session_factory):
+    jobs = JobGenerator(seed=11).jobs(120)
+    expressions = {"GenAI agents": '"langchain" OR "rag" OR "agent"'}
+    with MockUpworkServer(jobs) as server:
+        for _ in range(2):
+            fetch_and_store(session_factory=session_factory, token="t", search_expressions=expressions, api_url=server.url)
+        matched = len(server.matching(expressions["GenAI agents"]))
+
+    def override():
+        with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override
+    try:
+        client = TestClient(app)
+        budgets = client.get("/stats").json()["budgets"]
+        assert sum(b["count"] for b in budgets) == matched
+        hourly = client.get("/stats/budgets", params={"budget_type": "hourly", "q": [0.5, 0.9]}).json()
+        assert hourly and all(b["budget_type"] == "hourly" for b in hourly)
+        assert all(b["quantiles"]["p50"] <= b["quantiles"]["p90"] for b in hourly)
+        assert client.get("/stats/budgets", params={"q": 2}).status_code == 422
+    finally:
+        app.dependency_overrides.pop(get_session, None)
+
+
+def _sketches(session):
+    return {(s.domain, s.skill, s.month, s.budget_type): (s.count, s.sketch) for s in session.scalars(select(BudgetSketch))}
+
+
+def test_rebuild_reproduces_sketches_across_both_tiers(session_factory):
+    # Every domain search: postings matching several of them must land in one domain consistently.
+    with MockUpworkServer(JobGenerator(seed=12).jobs(300)) as server:
+        fetch_and_store(session_factory=session_factory, token="t", api_url=server.url)
+    with session_factory() as session:
+        assert archive_jobs(session, older_than_days=30, now=datetime(2025, 10, 1)) > 0
+        before = _sketches(session)
+        assert rebuild_budget_sketches(session, "USD") > 0
+        assert _sketches(session) == before
+
+
+def test_concurrent_worker_processes_count_each_job_once(session_factory):
+    # Overlapping searches, so several processes see the same postings at the same time.
+    searches = {f"s{i}": expr for i, expr in enumerate(['"langchain" OR "rag"', '"rag" OR "agent"', '"agent" OR "langchain"', '"rag"'])}
+    with session_factory() as session:
+        register_searches(session, searches)
+        database_url = session.get_bind().url.render_as_string(hide_password=False)
+
+    with MockUpworkServer(JobGenerator(seed=13).jobs(400), latency=0.002) as server:
+        workers = WorkerProcesses(database_url, server.url, 4, rate=1000, capacity=50, page_size=5)
+        try:
+            workers.run()
+        finally:
+            workers.stop()
+
+    with session_factory() as session:
+        jobs = session.execute(select(Job.budget_type, Job.budget_min_base, Job.budget_max_base)).mappings().all()
+        budgeted = sum(1 for j in jobs if j["budget_type"] and budget_value(j) is not None)
+        counted = sum(s.count for s in session.scalars(select(BudgetSketch).where(BudgetSketch.skill == ALL_SKILLS)))
+        assert counted == budgeted > 0
@@ -0,0 +1,187 @@
+"""PURPOSE: Tests for the search lease queue, shared rate limiter and multi-worker ingestion.
+"""
+
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select, update
+
+from app.clients.ratelimit import SharedTokenBucket, TokenBucket
+from app.jobs.fetcher import fetch_and_store
+from app.scheduler.cron import run_worker_async
+from app.scheduler.leases import claim, due_count, heartbeat, register_searches, release
+from app.storage.models import Job, RateLimitBucket, SearchLease
+from benchmarks.mock_upwork import MockUpworkServer
+from benchmarks.synthetic import JobGenerator
+from benchmarks.workers import WorkerProcesses
+
+NOW = datetime(2025, 10, 1, 12, 0)
+
+
+@pytest.fixture
+def queued(session_factory):
+    with session_factory() as session:
+        register_searches(session, {f"s{i}": f'"term{i}"' for i in range(3)})
+        session.execute(SearchLease.__table__.update().values(next_run_at=NOW - timedelta(minutes=1)))
+        session.commit()
+    return session_factory
+
+
+def test_register_is_idempotent(queued):
+    with queued() as session:
+        assert register_searches(session, {"s0": "changed", "s9": '"new"'}) == 1
+        assert session.get(SearchLease, "s0").expression == '"term0"'
+
+
+def test_claims_are_exclusive_until_expiry(queued):
+    with queued() as a, queued() as b:
+        first = claim(a, "w1", limit=2, lease_seconds=60, now=NOW)
+        second = claim(b, "w2", limit=2, lease_seconds=60, now=NOW)
+        assert len(first) == 2 and len(second) == 1
+        assert not {l["key"] for l in first} & {l["key"] for l in second}
+        assert claim(a, "w3", now=NOW) == []
+        # w1 crashes: after expiry its searches are re-leased.
+        later = NOW + timedelta(seconds=61)
+        heartbeat(b, "w2", [second[0]["key"]], lease_seconds=60, now=NOW + timedelta(seconds=30))
+        assert {l["key"] for l in claim(b, "w3", limit=5, now=later)} == {l["key"] for l in first}
+
+
+def test_release_reschedules_and_ignores_stolen_leases(queued):
+    with queued() as session:
+        key = claim(session, "w1", now=NOW)[0]["key"]
+        assert release(session, "w2", key, 900, now=NOW) is False
+        assert release(session, "w1", key, 900, now=NOW) is True
+        assert session.get(SearchLease, key).next_run_at == NOW + timedelta(seconds=900)
+        assert due_count(session, now=NOW) == 2
+
+        key = claim(session, "w1", now=NOW)[0]["key"]
+        release(session, "w1", key, 900, success=False, now=NOW)
+        row = session.get(SearchLease, key)
+        assert row.failures == 1 and row.next_run_at < NOW + timedelta(seconds=900)
+
+
+def test_sqlite_reads_do_not_take_the_write_lock(session_factory):
+    with session_factory() as reader, session_factory() as writer:
+        assert reader.scalar(select(func.count(Job.id))) == 0  # leaves a read transaction open
+        start = time.perf_counter()
+        assert register_searches(writer, {"s": '"x"'}) == 1
+        assert time.perf_counter() - start < 1
+        assert reader.scalar(select(func.count(SearchLease.key))) == 0  # still its own snapshot
+
+
+def test_token_buckets_share_budget(session_factory):
+    local = TokenBucket(rate=2, capacity=2)
+    assert local.try_acquire(now=0) == 0 and local.try_acquire(now=0) == 0
+    assert local.try_acquire(now=0) == pytest.approx(0.5)
+
+    a = SharedTokenBucket(session_factory, "upwork", rate=1, capacity=3)
+    b = SharedTokenBucket(session_factory, "upwork", rate=1, capacity=3)
+    assert [a.try_acquire(now=100), b.try_acquire(now=100), a.try_acquire(now=100)] == [0, 0, 0]
+    assert b.try_acquire(now=100) == pytest.approx(1.0)
+    assert b.try_acquire(now=101) == 0
+
+
+def test_shared_bucket_reserves_tokens_in_batches(session_factory):
+    bucket = SharedTokenBucket(session_factory, "upwork", rate=1, capacity=10, batch=4)
+    assert [bucket.try_acquire(now=100) for _ in range(4)] == [0, 0, 0, 0]
+    with session_factory() as session:
+        row = session.get(RateLimitBucket, "upwork")
+        assert (row.tokens, row.version) == (6, 0)  # one DB write served four requests
+    other = SharedTokenBucket(session_factory, "upwork", rate=1, capacity=10, batch=4)
+    assert other.try_acquire(now=100) == 0
+    with session_factory() as session:
+        assert session.get(RateLimitBucket, "upwork").tokens == 2
+
+
+class CountingBucket(TokenBucket):
+    acquired = 0
+
+    async def acquire(self) -> None:
+        self.acquired += 1
+        await super().acquire()
+
+
+def test_rate_limiter_is_charged_for_429_retries(session_factory):
+    limiter = CountingBucket(rate=1000, capacity=50)
+    with MockUpworkServer(JobGenerator(seed=9).jobs(100), rate_limit_every=2, retry_after=0.001) as server:
+        fetch_and_store(
+            session_factory=session_factory, token="t", search_expressions={"cv": '"opencv" OR "yolo"'},
+            api_url=server.url, page_size=5, rate_limiter=limiter,
+        )
+    assert server.rate_limited > 0
+    assert limiter.acquired == server.requests
+
+
+def test_worker_stops_fetching_when_lease_is_lost(session_factory):
+    with session_factory() as session:
+        register_searches(session, {"genai": '"langchain" OR "rag" OR "agent"'})
+
+    async def steal_lease(url):
+        worker = asyncio.create_task(run_worker_async(
+            "w1", session_factory, "t", api_url=url, page_size=2, lease_seconds=1, drain=True,
+            rate_limiter=TokenBucket(rate=1000, capacity=50),
+        ))
+        await asyncio.sleep(0.1)
+        with session_factory() as session:
+            session.execute(update(SearchLease).values(leased_by="w2"))
+            session.commit()
+        return await asyncio.wait_for(worker, timeout=5)
+
+    # ~100 matches at 2 per page and 50 ms per page would take several seconds to finish.
+    with MockUpworkServer(JobGenerator(seed=9).jobs(300), latency=0.05) as server:
+        start = time.perf_counter()
+        assert asyncio.run(steal_lease(server.url)) == 0
+        assert time.perf_counter() - start < 2
+        time.sleep(0.1)  # the mock counts a request after its latency, even if the client gave up
+        requests = server.requests
+        time.sleep(0.2)
+        assert server.requests == requests
+
+    with session_factory() as session:
+        assert session.get(SearchLease, "genai").leased_by == "w2"
+
+
+def _run_worker_processes(factory, workers: int) -> None:
+    jobs = JobGenerator(seed=9).jobs(150)
+    searches = {"genai": '"langchain" OR "rag"', "cv": '"opencv" OR "yolo"', "ml": '"xgboost"', "spark": '"spark"'}
+    with factory() as session:
+        register_searches(session, searches)
+        database_url = session.get_bind().url.render_as_string(hide_password=False)
+
+    with MockUpworkServer(jobs, latency=0.005) as server:
+        processes = WorkerProcesses(database_url, server.url, workers, rate=1000, capacity=50, page_size=10)
+        try:
+            processes.run()
+        finally:
+            processes.stop()
+        expected = {j["id"] for expr in searches.values() for j in server.matching(expr)}
+
+    with factory() as session:
+        assert session.scalar(select(func.count(Job.id))) == len(expected)
+        leases = session.scalars(select(SearchLease)).all()
+        assert all(l.leased_by is None and l.last_completed_at for l in leases)
+        assert due_count(session) == 0
+
+
+def test_worker_processes_split_searches(session_factory):
+    _run_worker_processes(session_factory, 2)
+
+
+def test_postgres_claims_skip_locked_rows(pg_session_factory):
+    with pg_session_factory() as session:
+        register_searches(session, {f"s{i}": f'"term{i}"' for i in range(3)})
+        session.execute(update(SearchLease).values(next_run_at=NOW - timedelta(minutes=1)))
+        session.commit()
+    with pg_session_factory() as holder, pg_session_factory() as other:
+        # `holder` sits on a row lock, as a claim in flight would; `other` skips that row rather than wait.
+        locked = holder.scalars(select(SearchLease).where(SearchLease.key == "s0").with_for_update()).one()
+        assert {l["key"] for l in claim(other, "w2", limit=3, now=NOW)} == {"s1", "s2"}
+        holder.rollback()
+        assert [l["key"] for l in claim(other, "w3", limit=3, now=NOW)] == [locked.key]
+
+
+def test_postgres_worker_processes_split_searches(pg_session_factory):
+    _run_worker_processes(pg_session_factory, 3)
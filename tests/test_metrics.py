@@ -0,0 +1,137 @@
+"""PURPOSE: Tests for the in-process metrics layer, JSON logging, and the /metrics route.
+"""
+
+
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import sys
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app.api.main import app
+from app.jobs.classifier import CLASSIFY_SECONDS, classify
+from app.scheduler.cron import run_worker_async
+from app.scheduler.leases import register_searches
+from app.storage.db import get_session
+from app.utils.logging import JsonFormatter
+from app.utils.metrics import Histogram, counter, histogram, render_prometheus, start_http_server
+from benchmarks.mock_upwork import MockUpworkServer
+from benchmarks.synthetic import JobGenerator
+
+
+def test_histogram_buckets_are_cumulative():
+    h = Histogram("t_hist", "test", buckets=(0.1, 1.0))
+    for v in (0.05, 0.5, 0.5, 5.0):
+        h.observe(v)
+    snap = h.snapshot()
+    assert snap["count"] == 4
+    assert snap["buckets"] == {0.1: 1, 1.0: 3, float("inf"): 4}
+
+
+def test_timer_as_context_manager_and_decorator():
+    h = Histogram("t_timer", "test")
+    with h.time() as t:
+        pass
+    assert t.elapsed is not None
+
+    @h.time()
+    def sync_fn():
+        return 1
+
+    @h.time()
+    async def async_fn():
+        return 2
+
+    assert sync_fn() == 1
+    assert asyncio.run(async_fn()) == 2
+    assert h.snapshot()["count"] == 3
+
+
+def test_registry_returns_same_metric_and_renders_labels():
+    c = counter("t_requests_total", "test", labelnames=("code",))
+    assert counter("t_requests_total", "test", labelnames=("code",)) is c
+    c.inc(code="429")
+    h = histogram("t_latency_seconds", "test", labelnames=("route",))
+    h.observe(0.01, route="/jobs")
+    text = render_prometheus()
+    assert 't_requests_total{code="429"} 1' in text
+    assert 't_latency_seconds_bucket{route="/jobs",le="+Inf"} 1' in text
+    assert 't_latency_seconds_count{route="/jobs"} 1' in text
+
+
+def test_classify_is_timed():
+    before = CLASSIFY_SECONDS.snapshot()["count"]
+    assert classify("Build a LangChain agent") == "GenAI agents"
+    assert CLASSIFY_SECONDS.snapshot()["count"] == before + 1
+
+
+def test_json_formatter_includes_extra_fields():
+    record = logging.LogRecord("app", logging.INFO, __file__, 1, "page fetched", None, None)
+    record.elapsed_ms = 12.5
+    payload = json.loads(JsonFormatter().format(record))
+    assert payload["message"] == "page fetched"
+    assert payload["elapsed_ms"] == 12.5
+
+
+def test_metrics_endpoint_exposes_api_latency():
+    client = TestClient(app)
+    assert client.get("/health").status_code == 200
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    assert 'api_request_seconds_count{method="GET",route="/health",status="200"}' in resp.text
+
+
+def test_metrics_endpoint_records_unhandled_errors_as_500():
+    def broken_session():
+        raise RuntimeError("database unavailable")
+        yield
+
+    app.dependency_overrides[get_session] = broken_session
+    try:
+        client = TestClient(app, raise_server_exceptions=False)
+        assert client.get("/stats").status_code == 500
+    finally:
+        app.dependency_overrides.pop(get_session, None)
+    text = TestClient(app).get("/metrics").text
+    assert 'api_request_seconds_count{method="GET",route="/stats",status="500"}' in text
+
+
+def test_worker_ingestion_metrics_can_be_scraped(session_factory):
+    with session_factory() as session:
+        register_searches(session, {"genai": '"langchain" OR "rag"'})
+    server = start_http_server(0, host="127.0.0.1")
+    try:
+        with MockUpworkServer(JobGenerator(seed=6).jobs(40)) as api:
+            asyncio.run(run_worker_async("w1", session_factory, "t", api_url=api.url, page_size=10, drain=True))
+        host, port = server.server_address[:2]
+        resp = httpx.get(f"http://{host}:{port}/metrics")
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    for series in ("upwork_gql_page_seconds_count", "classify_seconds_count", "fetch_queue_depth "):
+        assert series in resp.text
+
+
+def test_scheduler_sweep_writes_metrics_textfile(tmp_path):
+    textfile = tmp_path / "ingest.prom"
+    with MockUpworkServer(JobGenerator(seed=6).jobs(40)) as api:
+        env = dict(
+            os.environ,
+            DATABASE_URL=f"sqlite:///{tmp_path / 'sweep.db'}",
+            UPWORK_API_URL=api.url,
+            UPWORK_ACCESS_TOKEN="t",
+        )
+        subprocess.run(
+            [sys.executable, "-m", "app.scheduler.cron", "--metrics-textfile", str(textfile)],
+            env=env, check=True, timeout=60,
+        )
+    text = textfile.read_text()
+    assert "upwork_gql_page_seconds_count" in text
+    assert "classify_seconds_count" in text
@@ -0,0 +1,108 @@
+"""PURPOSE: Tests for ingestion (GraphQL client, upsert, fetch_and_store), /jobs, /stats and the benchmark helpers.
+"""
+
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from app.api.main import app
+from app.jobs.classifier import classify
+from app.jobs.fetcher import fetch_and_store, to_row
+from app.storage.db import get_session
+from app.storage.models import Job
+from app.storage.repository import upsert_jobs
+from benchmarks.mock_upwork import MockUpworkServer
+from benchmarks.run import compare
+from benchmarks.synthetic import JobGenerator
+
+
+def test_generator_is_deterministic():
+    assert JobGenerator(seed=7).jobs(20) == JobGenerator(seed=7).jobs(20)
+    assert JobGenerator(seed=7).jobs(5) != JobGenerator(seed=8).jobs(5)
+
+
+def test_classify_matches_whole_words_only():
+    assert classify("OpenCV defect detection, images in S3 storage") == "Computer Vision"
+    assert classify("Improve test coverage") is None
+    assert classify("Build a RAG pipeline") == "GenAI agents"
+
+
+def test_classifier_decides_domain_and_search_domain_fills_in():
+    node = {"id": "1", "title": "LangChain agent", "description": "RAG over PDFs"}
+    assert to_row(node, "Computer Vision")["domain"] == "GenAI agents"
+    assert to_row({"id": "2", "title": "Bakery website"}, "Saved search")["domain"] == "Saved search"
+
+
+def test_budgets_keep_cents(session_factory):
+    node = {
+        "id": "1",
+        "hourlyBudgetMin": {"rawValue": "12.50", "currency": "USD"},
+        "hourlyBudgetMax": {"rawValue": "30.75", "currency": "USD"},
+    }
+    with session_factory() as session:
+        upsert_jobs(session, [to_row(node)])
+        job = session.get(Job, "1")
+        assert (job.budget_type, job.budget_min, job.budget_max) == ("hourly", 12.5, 30.75)
+
+
+def test_update_keeps_the_first_stored_domain(session_factory):
+    row = to_row({"id": "1", "title": "Bakery website"}, "First search")
+    with session_factory() as session:
+        upsert_jobs(session, [row])
+        upsert_jobs(session, [dict(row, domain="Second search", title="Bakery shop")])
+        job = session.get(Job, "1")
+        assert (job.domain, job.title) == ("First search", "Bakery shop")
+
+
+def test_upsert_inserts_then_updates(session_factory):
+    rows = [to_row(n) for n in JobGenerator(seed=1).jobs(30)]
+    with session_factory() as session:
+        assert upsert_jobs(session, rows) == 30
+        rows[0]["title"] = "changed"
+        upsert_jobs(session, rows[:1])
+        assert session.scalar(select(func.count(Job.id))) == 30
+        assert session.get(Job, rows[0]["id"]).title == "changed"
+
+
+def test_fetch_and_store_paginates_through_rate_limits(session_factory):
+    expressions = {"GenAI agents": '"langchain" OR "rag"'}
+    jobs = JobGenerator(seed=3).jobs(200)
+    with MockUpworkServer(jobs, rate_limit_every=3, retry_after=0.001) as server:
+        stored = fetch_and_store(
+            session_factory=session_factory, token="t", search_expressions=expressions,
+            api_url=server.url, page_size=10,
+        )
+        expected = len(server.matching(expressions["GenAI agents"]))
+    assert stored == expected > 10
+    assert server.rate_limited > 0
+    with session_factory() as session:
+        assert session.scalar(select(func.count(Job.id))) == expected
+
+
+def test_jobs_and_stats_endpoints(session_factory):
+    with session_factory() as session:
+        upsert_jobs(session, [to_row(n) for n in JobGenerator(seed=4).jobs(50)])
+
+    def override():
+        with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override
+    try:
+        client = TestClient(app)
+        listed = client.get("/jobs", params={"limit": 5}).json()
+        assert len(listed) == 5
+        assert listed[0]["posted_date"] >= listed[-1]["posted_date"]
+        stats = client.get("/stats").json()["domains"]
+        assert sum(d["jobs"] for d in stats) == 50
+    finally:
+        app.dependency_overrides.pop(get_session, None)
+
+
+def test_compare_flags_regressions():
+    baseline = {"benchmarks": {"a": {"median_s": 1.0}, "b": {"median_s": 1.0}}}
+    current = {"benchmarks": {"a": {"median_s": 1.1}, "b": {"median_s": 1.5}, "new": {"median_s": 9.0}}}
+    rows = {r["name"]: r for r in compare(current, baseline, threshold=0.2)}
+    assert set(rows) == {"a", "b"}
+    assert not rows["a"]["regressed"]
+    assert rows["b"]["regressed"]